@@ -0,0 +1,83 @@
+"""
+Benchmark importing a synthetic package of services that declare
+``autowired(auto)`` attributes.
+
+Each of the ``--services`` modules defines one service class with
+``--attributes`` annotated autowired attributes. The import of the whole
+package is timed in a fresh interpreter.
+
+Run with ``python benchmarks/autowired_import.py``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+SERVICE_MODULE = """\
+from anemic.ioc import autowired, auto
+from .dependencies import *
+
+
+class Service{index}:
+{attributes}
+
+    def __init__(self, container):
+        self.container = container
+"""
+
+IMPORT = textwrap.dedent(
+    """
+    import importlib
+    for index in range({services}):
+        importlib.import_module(f"synthetic_autowired.service{{index}}")
+    """
+)
+
+
+def make_package(root: str, services: int, attributes: int) -> None:
+    package = os.path.join(root, "synthetic_autowired")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    with open(os.path.join(package, "dependencies.py"), "w") as f:
+        for index in range(attributes):
+            f.write(f"class Dependency{index}:\n    pass\n\n\n")
+
+    lines = "\n".join(
+        f"    dependency{i}: Dependency{i} = autowired(auto)" for i in range(attributes)
+    )
+    for index in range(services):
+        with open(os.path.join(package, f"service{index}.py"), "w") as f:
+            f.write(SERVICE_MODULE.format(index=index, attributes=lines))
+
+
+def run(root: str, code: str) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([root, env.get("PYTHONPATH", "")])
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=300)
+    parser.add_argument("--attributes", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_package(root, args.services, args.attributes)
+        code = IMPORT.format(services=args.services)
+        run(root, code)
+        baseline = min(run(root, "import anemic.ioc") for _ in range(args.repeat))
+        imported = min(run(root, code) for _ in range(args.repeat))
+
+    print(f"{'interpreter + import anemic.ioc':<32} {baseline * 1000:>8.1f} ms")
+    print(f"{'import services':<32} {imported * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
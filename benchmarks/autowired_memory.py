@@ -0,0 +1,76 @@
+"""
+Compare the memory used by services that cache their autowired attributes
+in the instance dictionary with services that cache them in slots.
+
+Each of the ``--instances`` services has ``--attributes`` autowired
+attributes, all of which are resolved before measuring.
+
+Run with ``python benchmarks/autowired_memory.py``.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from anemic.ioc import Container, FactoryRegistry, autowired, autowired_slots
+
+
+def make_classes(attributes: int) -> tuple[type, type]:
+    names = [f"dependency{i}" for i in range(attributes)]
+
+    def init(self, container):
+        self.container = container
+
+    plain = type(
+        "Plain",
+        (),
+        {"__init__": init, **{name: autowired(int, name=name) for name in names}},
+    )
+    slotted = autowired_slots(
+        type(
+            "Slotted",
+            (),
+            {
+                "__slots__": ("container",),
+                "__init__": init,
+                **{name: autowired(int, name=name) for name in names},
+            },
+        )
+    )
+    return plain, slotted
+
+
+def measure(cls: type, container: Container, instances: int, names: list[str]):
+    gc.collect()
+    tracemalloc.start()
+    services = []
+    for _ in range(instances):
+        service = cls(container)
+        for name in names:
+            getattr(service, name)
+
+        services.append(service)
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / instances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=100_000)
+    parser.add_argument("--attributes", type=int, default=5)
+    args = parser.parse_args()
+
+    names = [f"dependency{i}" for i in range(args.attributes)]
+    registry = FactoryRegistry("application")
+    for index, name in enumerate(names):
+        registry.register(interface=int, name=name, factory=lambda c, i=index: i)
+
+    container = Container(registry)
+    for cls in make_classes(args.attributes):
+        per_instance = measure(cls, container, args.instances, names)
+        print(f"{cls.__name__:<8} {per_instance:>8.1f} bytes per instance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark resolving services registered only in the outermost scope of 1-,
+3- and 5-level container chains.
+
+* ``warm``: resolution plans compiled
+* ``cold``: resolution plans discarded before each lookup, as happens after
+  any registry in the chain changes
+* ``missing``: looking up a service that is not registered anywhere
+
+The ``cold`` and ``missing`` cases are run both with the negative lookup
+cache of the registries and without it, by clearing the remembered misses
+before each lookup as well, for a before/after comparison.
+
+Run with ``python benchmarks/parent_chain.py``.
+"""
+import timeit
+
+from anemic.ioc import Container, FactoryRegistry
+
+
+class Context:
+    pass
+
+
+class Service:
+    def __init__(self, container):
+        self.container = container
+
+
+def make_chain(depth: int) -> list[FactoryRegistry]:
+    registries = [FactoryRegistry("application")]
+    for level in range(1, depth):
+        registries.append(FactoryRegistry(f"level{level}", supports_contexts=True))
+
+    registries[0].register(interface=Service, factory=Service)
+    return registries
+
+
+def make_container(registries: list[FactoryRegistry], root: Container) -> Container:
+    container = root
+    for registry in registries[1:]:
+        container = Container(registry, container)
+
+    return container
+
+
+def bench(depth: int, number: int, negative_cache: bool = True) -> dict[str, float]:
+    """
+    Time the cases in µs per lookup. If `negative_cache` is false, the
+    remembered misses of every registry in the chain are forgotten before
+    each ``cold`` and ``missing`` lookup.
+    """
+    registries = make_chain(depth)
+    leaf = make_container(registries, Container(registries[0]))
+    context = Context()
+    leaf_registry = registries[-1]
+
+    def forget_misses():
+        if not negative_cache:
+            for registry in registries:
+                registry._misses.clear()
+
+    def warm():
+        leaf.get(interface=Service, context=context)
+
+    def cold():
+        leaf_registry._clear_plans()
+        forget_misses()
+        leaf.get(interface=Service, context=context)
+
+    def missing():
+        forget_misses()
+        try:
+            leaf.get(name="missing", context=context)
+        except LookupError:
+            pass
+
+    results = {}
+    for label, func in [("warm", warm), ("cold", cold), ("missing", missing)]:
+        func()
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[label] = best / number * 1e6
+
+    return results
+
+
+def main(number: int = 20000) -> None:
+    print("µs per lookup; before = without the negative lookup cache")
+    print(
+        f"{'depth':>5} {'warm':>8} {'cold before':>12} {'cold after':>11} "
+        f"{'missing before':>15} {'missing after':>14}"
+    )
+    for depth in (1, 3, 5):
+        before = bench(depth, number, negative_cache=False)
+        after = bench(depth, number)
+        print(
+            f"{depth:>5} {after['warm']:>8.2f} {before['cold']:>12.2f} "
+            f"{after['cold']:>11.2f} {before['missing']:>15.2f} "
+            f"{after['missing']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark registering the services of a synthetic package with
+`FactoryRegistrySet.scan_services` versus `FactoryRegistrySet.load_manifest`.
+
+The package has ``--modules`` modules, of which every ``--service-every``th
+defines a service; the rest only define plain functions. Each measurement
+runs in a fresh interpreter so that module imports are included.
+
+Run with ``python benchmarks/scan_manifest.py``.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+SERVICE_MODULE = textwrap.dedent(
+    """
+    from anemic.ioc import service, autowired, auto
+
+
+    @service(scope="application")
+    class Service{index}:
+        def __init__(self, container):
+            self.container = container
+    """
+)
+
+PLAIN_MODULE = textwrap.dedent(
+    """
+    def helper{index}(value):
+        return value * {index}
+    """
+)
+
+SCAN = textwrap.dedent(
+    """
+    import synthetic_services
+    from anemic.ioc import FactoryRegistrySet
+
+    registry_set = FactoryRegistrySet()
+    registry_set.create_registry("application")
+    registry_set.scan_services(synthetic_services)
+    if {write!r}:
+        registry_set.write_manifest({manifest!r})
+    """
+)
+
+LOAD = textwrap.dedent(
+    """
+    from anemic.ioc import FactoryRegistrySet
+
+    registry_set = FactoryRegistrySet()
+    registry_set.create_registry("application")
+    registry_set.load_manifest({manifest!r})
+    """
+)
+
+
+def make_package(root: str, modules: int, service_every: int) -> None:
+    package = os.path.join(root, "synthetic_services")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    for index in range(modules):
+        template = SERVICE_MODULE if index % service_every == 0 else PLAIN_MODULE
+        with open(os.path.join(package, f"module{index}.py"), "w") as f:
+            f.write(template.format(index=index))
+
+
+def run(root: str, code: str) -> float:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([root, env.get("PYTHONPATH", "")])
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=600)
+    parser.add_argument("--service-every", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_package(root, args.modules, args.service_every)
+        manifest = os.path.join(root, "manifest.json")
+        run(root, SCAN.format(manifest=manifest, write=True))
+        baseline = min(run(root, "import anemic.ioc") for _ in range(args.repeat))
+        scan = min(
+            run(root, SCAN.format(manifest=manifest, write=False))
+            for _ in range(args.repeat)
+        )
+        load = min(
+            run(root, LOAD.format(manifest=manifest)) for _ in range(args.repeat)
+        )
+
+    print(f"{'interpreter + import anemic.ioc':<32} {baseline * 1000:>8.1f} ms")
+    print(f"{'scan_services':<32} {scan * 1000:>8.1f} ms")
+    print(f"{'load_manifest':<32} {load * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
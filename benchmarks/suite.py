@@ -0,0 +1,235 @@
+"""
+Run the anemic.ioc microbenchmarks and compare them against a baseline.
+
+Every case is reported in microseconds (milliseconds for ``scan``) per
+operation, lower being better:
+
+* ``get.hit``: a cached service from an application container
+* ``get.miss``: the first construction of a service, in a new container
+  each time; includes creating the container
+* ``get.missing``: a service that is not registered
+* ``context.mro<N>``: compiling the plan of a service registered for the
+  base of a context type that is ``N`` classes deep
+* ``chain<N>.warm|cold|missing``: a 1-, 3- and 5-level container chain;
+  see ``parent_chain.py``
+* ``autowired.first``, ``autowired.cached``: the first and the later
+  accesses of an autowired attribute
+* ``scan``: `FactoryRegistrySet.scan_services` over a synthetic package in
+  a fresh interpreter; see ``scan_manifest.py``
+* ``contention<N>``: a request cycle in ``N`` threads sharing an
+  application container; see ``threaded_resolution.py``
+
+Save a baseline with ``python benchmarks/suite.py --save``. Later runs
+compare against it and exit with status 1 if any case is slower than the
+baseline by more than ``--threshold`` (25 % by default).
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import Callable
+
+import parent_chain
+import scan_manifest
+import threaded_resolution
+from anemic.ioc import Container, FactoryRegistry, auto, autowired
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class Service:
+    def __init__(self, container):
+        self.container = container
+
+
+class Consumer:
+    service: Service = autowired(auto)
+
+    def __init__(self, container):
+        self.container = container
+
+
+def best_of(func: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """
+    The best time of a call of `func` in microseconds.
+    """
+    func()
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def bench_get(number: int) -> dict[str, float]:
+    registry = FactoryRegistry("application")
+    registry.register(interface=Service, factory=Service)
+    container = Container(registry)
+
+    def hit():
+        container.get(interface=Service)
+
+    def miss():
+        Container(registry).get(interface=Service)
+
+    def missing():
+        try:
+            container.get(interface=Service, name="missing")
+        except LookupError:
+            pass
+
+    return {
+        "get.hit": best_of(hit, number),
+        "get.miss": best_of(miss, number),
+        "get.missing": best_of(missing, number),
+    }
+
+
+def bench_context_mro(number: int) -> dict[str, float]:
+    results = {}
+    for depth in (1, 5, 10):
+        context_type: type = object
+        for level in range(depth):
+            context_type = type(f"Context{level}", (context_type,), {})
+
+        registry = FactoryRegistry("request", supports_contexts=True)
+        registry.register(interface=Service, factory=Service, context_type=object)
+        container = Container(registry)
+        context = context_type()
+
+        def cold():
+            registry._clear_plans()
+            container.get(interface=Service, context=context)
+
+        results[f"context.mro{depth}"] = best_of(cold, number)
+
+    return results
+
+
+def bench_parent_chain(number: int) -> dict[str, float]:
+    results = {}
+    for depth in (1, 3, 5):
+        for label, value in parent_chain.bench(depth, number).items():
+            results[f"chain{depth}.{label}"] = value
+
+    return results
+
+
+def bench_autowired(number: int) -> dict[str, float]:
+    registry = FactoryRegistry("application")
+    registry.register(interface=Service, factory=Service)
+    container = Container(registry)
+    consumer = Consumer(container)
+
+    def first():
+        Consumer(container).service
+
+    def cached():
+        consumer.service
+
+    return {
+        "autowired.first": best_of(first, number),
+        "autowired.cached": best_of(cached, number),
+    }
+
+
+def bench_scan(modules: int = 200, repeat: int = 3) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as root:
+        scan_manifest.make_package(root, modules, 3)
+        manifest = os.path.join(root, "manifest.json")
+        code = scan_manifest.SCAN.format(manifest=manifest, write=False)
+        seconds = min(scan_manifest.run(root, code) for _ in range(repeat))
+
+    return {"scan": seconds * 1000}
+
+
+def bench_contention(duration: float) -> dict[str, float]:
+    results = {}
+    for threads in (1, 4):
+        ops = threaded_resolution.run(threads, duration, False, "request")
+        results[f"contention{threads}"] = 1e6 / ops
+
+    return results
+
+
+def run_all(pattern: str, number: int, duration: float) -> dict[str, float]:
+    benches: list[tuple[str, Callable[[], dict[str, float]]]] = [
+        ("get.*", lambda: bench_get(number)),
+        ("context.*", lambda: bench_context_mro(number)),
+        ("chain*", lambda: bench_parent_chain(number)),
+        ("autowired.*", lambda: bench_autowired(number)),
+        ("scan", bench_scan),
+        ("contention*", lambda: bench_contention(duration)),
+    ]
+    results = {}
+    for names, bench in benches:
+        if fnmatch.fnmatch(names, pattern) or fnmatch.fnmatch(pattern, names):
+            results.update(
+                (name, value)
+                for name, value in bench().items()
+                if fnmatch.fnmatch(name, pattern)
+            )
+
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """
+    Print the results next to the baseline, and return the names of the
+    cases that regressed by more than the threshold.
+    """
+    regressions = []
+    print(f"{'case':<24} {'current':>10} {'baseline':>10} {'change':>8}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<24} {value:>10.2f} {'-':>10} {'-':>8}")
+            continue
+
+        change = value / base - 1
+        marker = ""
+        if change > threshold:
+            regressions.append(name)
+            marker = "  REGRESSION"
+
+        print(f"{name:<24} {value:>10.2f} {base:>10.2f} {change:>+8.1%}{marker}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="save as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--only", default="*", help="run the matching cases")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=0.5)
+    args = parser.parse_args()
+
+    results = run_all(args.only, args.number, args.duration)
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+        print(f"Saved {len(results)} cases to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} cases regressed by more than {args.threshold:.0%}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
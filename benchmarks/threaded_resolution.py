@@ -0,0 +1,108 @@
+"""
+Benchmark the throughput of service resolution from many threads sharing
+one application container. In the default ``request`` mode, each operation
+creates a request container and resolves three application-scoped services
+and one request-scoped service. In the ``hits`` mode, each thread resolves
+the same four services from a single request container, so that only the
+cache hit path is measured.
+
+Run with ``python benchmarks/threaded_resolution.py``. Pass ``--frozen`` to
+freeze the registries before the run. On free-threaded builds of Python,
+the throughput should scale with the number of threads.
+"""
+import argparse
+import threading
+import time
+
+from anemic.ioc import Container, FactoryRegistrySet
+
+
+class Engine:
+    def __init__(self, container):
+        self.container = container
+
+
+class Settings:
+    def __init__(self, container):
+        self.container = container
+
+
+class Cache:
+    def __init__(self, container):
+        self.container = container
+
+
+class Session:
+    def __init__(self, container):
+        self.container = container
+
+
+def make_registries(frozen: bool):
+    registry_set = FactoryRegistrySet()
+    application_registry = registry_set.create_registry("application")
+    request_registry = registry_set.create_registry("request")
+    for cls in (Engine, Settings, Cache):
+        application_registry.register(interface=cls, factory=cls)
+
+    request_registry.register(interface=Session, factory=Session)
+    if frozen:
+        registry_set.freeze()
+
+    return application_registry, request_registry
+
+
+def run(threads: int, duration: float, frozen: bool, mode: str) -> float:
+    application_registry, request_registry = make_registries(frozen)
+    app_container = Container(application_registry)
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        n = 0
+        container = Container(request_registry, app_container)
+        while not stop.is_set():
+            for _ in range(100):
+                if mode == "request":
+                    container = Container(request_registry, app_container)
+
+                container.get(interface=Engine)
+                container.get(interface=Settings)
+                container.get(interface=Cache)
+                container.get(interface=Session)
+
+            n += 100
+
+        counts[index] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--frozen", action="store_true")
+    parser.add_argument("--mode", choices=["request", "hits"], default="request")
+    args = parser.parse_args()
+
+    print(f"{'threads':>7} {'ops/s':>12}")
+    for threads in args.threads:
+        ops = run(threads, args.duration, args.frozen, args.mode)
+        print(f"{threads:>7} {ops:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure the startup time, the number of imported modules and the peak RSS
+of a process that creates a configurator with all the Anemic features,
+with and without deferred features (the ``anemic.defer_features``
+setting). Each measurement runs in a fresh interpreter.
+
+Requires Pyramid and the dependencies of the features, e.g. tonnikala.
+Run with ``python benchmarks/web_features.py``.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import textwrap
+
+CODE = textwrap.dedent(
+    """
+    import json
+    import resource
+    import sys
+    import time
+
+    start = time.perf_counter()
+    from anemic.web.config import ALL_FEATURES, create_configurator
+
+    config = create_configurator(
+        settings={{"anemic.defer_features": {defer!r}}},
+        included_features=ALL_FEATURES,
+        package="anemic",
+    )
+    config.commit()
+    seconds = time.perf_counter() - start
+    print(json.dumps({{
+        "seconds": seconds,
+        "modules": len(sys.modules),
+        "maxrss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }}))
+    """
+)
+
+
+def run(defer: bool) -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CODE.format(defer=defer)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'features':<10} {'ms':>8} {'modules':>8} {'max RSS KiB':>12}")
+    for label, defer in [("eager", False), ("deferred", True)]:
+        runs = [run(defer) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["seconds"])
+        print(
+            f"{label:<10} {best['seconds'] * 1000:>8.1f} {best['modules']:>8} "
+            f"{best['maxrss_kib']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
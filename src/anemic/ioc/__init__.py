@@ -1,9 +1,81 @@
-from .container import (
-    Container,
-    auto,
-    autowired,
-    FactoryRegistry,
-    Factory,
-    service,
-    FactoryRegistrySet,
-)
+from typing import TYPE_CHECKING
+
+# the names of the package are imported from their modules on first access,
+# so that e.g. using only `Container` does not import asyncio
+_exports = {
+    "Container": "container",
+    "ContextCacheInfo": "container",
+    "Disposer": "container",
+    "auto": "container",
+    "autowired": "container",
+    "autowired_slots": "container",
+    "FactoryRegistry": "container",
+    "Factory": "container",
+    "service": "container",
+    "FactoryRegistrySet": "container",
+    "WarmUpTiming": "container",
+    "AsyncContainer": "async_container",
+    "aautowired": "async_container",
+    "prepare_fork": "fork",
+    "MemoStats": "memoize",
+    "container_memoize": "memoize",
+    "ProcessProxy": "processes",
+    "PoolStats": "pool",
+    "ServicePool": "pool",
+    "LatencyHistogram": "instrumentation",
+    "ResolutionObserver": "instrumentation",
+    "ResolutionStats": "instrumentation",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    module_name = _exports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .container import (
+        Container,
+        ContextCacheInfo,
+        Disposer,
+        auto,
+        autowired,
+        autowired_slots,
+        FactoryRegistry,
+        Factory,
+        service,
+        FactoryRegistrySet,
+        WarmUpTiming,
+    )
+    from .async_container import (
+        AsyncContainer,
+        aautowired,
+    )
+    from .fork import prepare_fork
+    from .memoize import (
+        MemoStats,
+        container_memoize,
+    )
+    from .processes import ProcessProxy
+    from .pool import (
+        PoolStats,
+        ServicePool,
+    )
+    from .instrumentation import (
+        LatencyHistogram,
+        ResolutionObserver,
+        ResolutionStats,
+    )
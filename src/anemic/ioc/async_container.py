@@ -0,0 +1,308 @@
+import asyncio
+import inspect
+import time
+from typing import Any, TypeVar
+
+from .container import (
+    Container,
+    Disposer,
+    Factory,
+    autowired,
+    _autowired_attributes,
+    _InFlight,
+    _ServiceCache,
+    _stripe_for,
+    _unset,
+)
+from .instrumentation import ResolutionObserver
+
+T = TypeVar("T")
+
+
+class _Ready:
+    """
+    An awaitable that has already been resolved to `value`.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __await__(self):
+        return self.value
+        yield  # pragma: no cover
+
+
+class aautowired(autowired[T]):
+    """
+    A descriptor that resolves a service from an `AsyncContainer`. Accessing
+    the attribute returns an awaitable; the service is resolved on the first
+    await and cached for the lifetime of the object it is accessed from.
+
+    .. code-block:: python
+
+        class Foo:
+            http: HttpClient = aautowired(auto)
+
+            async def fetch(self, url):
+                http = await self.http
+                return await http.get(url)
+
+    The services of the `aautowired` and the ``batch=True`` `autowired`
+    attributes of objects created by `AsyncContainer.aget` are resolved
+    concurrently before the object is returned. Other `autowired`
+    attributes are resolved on first access, as with `Container.get`.
+    """
+
+    def __get__(self, inst, objtype=None):
+        if inst is None:
+            return self
+
+        if self.slot is not None:
+            ready = getattr(inst, self.slot, _unset)
+            if ready is not _unset:
+                return ready
+
+        return self._resolve(inst)
+
+    async def _resolve(self, inst: Any) -> T:
+        val = await inst.container.aget(
+            interface=self._get_interface(),
+            name=self.iname,
+            context=self.context,
+        )
+        self._store(inst, val)
+        return val
+
+    def _store(self, inst: object, val: Any) -> None:
+        super()._store(inst, _Ready(val))
+
+
+class _AsyncInFlight:
+    """
+    A service that is being constructed by the task `owner`; `future` is
+    resolved when the construction finishes.
+    """
+
+    __slots__ = ("future", "owner")
+
+    def __init__(self):
+        self.future = asyncio.get_running_loop().create_future()
+        self.owner = asyncio.current_task()
+
+
+def _synchronous(factory: Factory) -> Factory:
+    def create(container: Container) -> Any:
+        service = factory(container)
+        if inspect.isawaitable(service):
+            close = getattr(service, "close", None)
+            if close is not None:
+                close()
+
+            raise TypeError(
+                f"Factory {factory!r} is asynchronous; resolve the service with "
+                f"`await container.aget(...)`"
+            )
+
+        return service
+
+    return create
+
+
+def _timed(
+    factory: Factory,
+    observer: ResolutionObserver,
+    scope: str,
+    interface: type,
+    name: str,
+) -> Factory:
+    async def timed_factory(container: Container) -> Any:
+        start = time.perf_counter()
+        try:
+            service = factory(container)
+            if inspect.isawaitable(service):
+                service = await service
+
+            return service
+        finally:
+            observer.factory_called(scope, interface, name, time.perf_counter() - start)
+
+    return timed_factory
+
+
+async def _prefetch_autowired(service: Any) -> None:
+    """
+    Resolve the `aautowired` and the batched `autowired` attributes of a
+    newly created service concurrently. An attribute whose service cannot
+    be resolved is left unresolved, so that the error is raised when the
+    attribute is used, as it would be without the prefetch.
+    """
+    container = getattr(service, "container", None)
+    if not isinstance(container, AsyncContainer):
+        return
+
+    pending = [
+        descriptor
+        for descriptor in _autowired_attributes(type(service))
+        if (isinstance(descriptor, aautowired) or descriptor.batch)
+        and (descriptor.slot is not None or hasattr(service, "__dict__"))
+        and descriptor._cached(service) is _unset
+    ]
+    if not pending:
+        return
+
+    values = await asyncio.gather(
+        *(
+            container.aget(
+                interface=descriptor._get_interface(),
+                name=descriptor.iname,
+                context=descriptor.context,
+            )
+            for descriptor in pending
+        ),
+        return_exceptions=True,
+    )
+    for descriptor, value in zip(pending, values):
+        if not isinstance(value, BaseException):
+            descriptor._store(service, value)
+
+
+async def _aget_or_create(
+    cache: _ServiceCache,
+    interface: type,
+    name: str,
+    factory: Factory,
+    container: Container,
+    disposer: Disposer | None,
+) -> Any:
+    key = interface, name
+    stripe = _stripe_for(key)
+    with stripe:
+        try:
+            return cache.cache[key]
+        except KeyError:
+            pass
+
+        flight = cache.in_flight.get(key)
+        if flight is None:
+            flight = cache.in_flight[key] = _AsyncInFlight()
+            constructing = True
+        else:
+            constructing = False
+
+    if not constructing:
+        if isinstance(flight, _InFlight):
+            # being constructed synchronously by another thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, flight.result)
+
+        if flight.owner is asyncio.current_task():
+            raise RuntimeError(
+                f"Circular dependency while constructing "
+                f"{interface.__name__} named {name!r}"
+            )
+
+        return await asyncio.shield(flight.future)
+
+    future = flight.future
+
+    try:
+        service = factory(container)
+        if inspect.isawaitable(service):
+            service = await service
+    except BaseException as e:
+        with stripe:
+            del cache.in_flight[key]
+
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            # the exception is re-raised here; do not log it as unretrieved
+            # when no other task was waiting for it
+            future.exception()
+
+        raise
+
+    with stripe:
+        service = cache._publish(key, service, container, disposer)
+        del cache.in_flight[key]
+
+    future.set_result(service)
+    # the service is published before its autowired attributes are
+    # prefetched, so that services autowiring each other find it in the
+    # cache instead of waiting for this construction
+    await _prefetch_autowired(service)
+    return service
+
+
+class AsyncContainer(Container):
+    """
+    A container that can construct services with asynchronous factories.
+    Services are resolved with `aget`; a factory may be an ``async def``
+    function or any callable returning an awaitable. Concurrent tasks
+    requesting the same service wait for a single construction.
+
+    Services with synchronous factories and already constructed services can
+    still be resolved with `get`.
+    """
+
+    def _sync_factory(self, factory: Factory) -> Factory:
+        return _synchronous(factory)
+
+    async def aget(
+        self,
+        *,
+        interface: type = object,
+        name: str = "",
+        context: Any = None,
+    ):
+        """
+        Resolve a service from the registry, awaiting the factory if it is
+        asynchronous. The `aautowired` and the batched `autowired` attributes
+        of the constructed service are resolved concurrently before it is
+        returned
+        to the task that constructed it. Other tasks may receive it as soon
+        as it has been constructed, e.g. when services autowire each other.
+
+        :param interface: The interface to resolve the service for
+        :param name: The name to resolve the service for
+        :param context: The context to resolve the service for
+        :return: The resolved service
+        """
+        observer = self.observer
+        if observer is not None:
+            owner, plan, context_cache = self._observed_locate(
+                observer, interface, name, context
+            )
+        else:
+            owner, plan, context_cache = self._locate(interface, name, context)
+
+        try:
+            service = context_cache.get(
+                interface=interface,
+                name=name,
+            )
+        except KeyError:
+            pass
+        else:
+            if observer is not None:
+                observer.cache_hit(owner.scope, interface, name)
+
+            return service
+
+        owner._check_open()
+        factory = plan.factory
+        if observer is not None:
+            observer.cache_miss(owner.scope, interface, name)
+            factory = _timed(factory, observer, owner.scope, interface, name)
+
+        return await _aget_or_create(
+            context_cache,
+            interface,
+            name,
+            factory,
+            owner,
+            plan.disposer,
+        )
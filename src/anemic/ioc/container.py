@@ -1,9 +1,13 @@
 import logging
+import os
 import sys
 import threading
+import time
 import types
 import weakref
+from collections import OrderedDict
 from typing import (
+    NamedTuple,
     Protocol,
     Any,
     Generic,
@@ -17,15 +21,31 @@ from typing import (
     IO,
 )
 
-try:
-    import venusian
+from .pool import ServicePool
+from .instrumentation import ResolutionObserver, _combine
+from . import fork, manifest
 
-    venusian_attach = venusian.attach
-except ImportError:
-    venusian = None
+# venusian, concurrent.futures, pkgutil and the process pool support are
+# slow to import, and are imported only when they are first needed
+_venusian: Any = None
+_venusian_imported = False
 
-    def venusian_attach(*a, **kw):
-        pass
+
+def _import_venusian() -> Any:
+    """
+    Import venusian, or return None if it is not installed.
+    """
+    global _venusian, _venusian_imported
+    if not _venusian_imported:
+        try:
+            import venusian
+        except ImportError:
+            venusian = None
+
+        _venusian = venusian
+        _venusian_imported = True
+
+    return _venusian
 
 
 logger = logging.getLogger(__name__)
@@ -47,6 +67,55 @@ class Factory(Protocol):
         """
 
 
+Disposer = Callable[[Any], Any]
+"""
+A callable that releases the resources held by a service when the container
+that created the service is closed. It is called with the service.
+"""
+
+
+class _LazyCallable:
+    """
+    A factory or disposer given as a dotted name. The object is imported on
+    the first call, once, even when called from several threads.
+    """
+
+    def __init__(self, dotted_name: str):
+        self.dotted_name = dotted_name
+        self._target: Callable[[Any], Any] | None = None
+        self._lock = threading.Lock()
+        fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Callable[[Any], Any]:
+        target = self._target
+        if target is None:
+            with self._lock:
+                if self._target is None:
+                    from pkgutil import resolve_name
+
+                    self._target = resolve_name(self.dotted_name)
+
+                target = self._target
+
+        return target
+
+    def __call__(self, argument: Any) -> Any:
+        return self.resolve()(argument)
+
+    def __repr__(self):
+        return f"<lazy {self.dotted_name}>"
+
+
+def _lazy(ob: Any) -> Any:
+    if isinstance(ob, str):
+        return _LazyCallable(ob)
+
+    return ob
+
+
 class _AutoMeta(type):
     def __repr__(self):
         return "<auto>"
@@ -61,6 +130,7 @@ class auto(metaclass=_AutoMeta):
 
 
 this = object()
+_unset = object()
 
 T = TypeVar("T")
 
@@ -77,10 +147,27 @@ class autowired(Generic[T]):
 
         class Foo:
             bar: Bar = autowired(auto)
+
+    With ``batch=True``, the first access to any batched attribute of an
+    object resolves all the batched attributes of its class with a single
+    `Container.get_many` call.
+
+    Classes with ``__slots__`` have no instance dictionary to cache the
+    service in; name a slot to cache it in with ``slot``, or let
+    `autowired_slots` generate the slots.
+
+    .. code-block:: python
+
+        class Foo:
+            __slots__ = ("container", "_bar")
+
+            bar: Bar = autowired(auto, slot="_bar")
     """
 
     interface: type[T] | type[object] | None = None
     names: list[str]
+    slot: str | None
+    _owner: type | None = None
 
     def __init__(
         self,
@@ -88,16 +175,26 @@ class autowired(Generic[T]):
         *,
         name: str = "",
         context: Any = None,
+        batch: bool = False,
+        slot: str | None = None,
     ):
         """
         :param interface: The interface to resolve the service for. If not
               specified, the interface is resolved from the type hint of the
+        :param name: The name of the service to resolve
+        :param context: The context to resolve the service for
+        :param batch: Whether to resolve the service together with the other
+              batched autowired attributes of the class on first access
+        :param slot: The name of the slot to cache the resolved service in,
+              for classes that define ``__slots__``
         """
         if interface is not auto:
             self.interface = interface
 
         self.iname = name
         self.context = context
+        self.batch = batch
+        self.slot = slot
         self.names: list[str] = []
 
     @overload
@@ -122,29 +219,189 @@ class autowired(Generic[T]):
         if inst is None:
             return self
 
+        if self.slot is not None:
+            val = getattr(inst, self.slot, _unset)
+            if val is not _unset:
+                return val
+
+        if self.batch:
+            return self._get_batch(inst)
+
+        val = inst.container.get(
+            interface=self._get_interface(),
+            name=self.iname,
+            context=self.context,
+        )
+        self._store(inst, val)
+        return val
+
+    def _get_batch(self, inst: Any) -> T:
+        pending = [
+            descriptor
+            for descriptor in _autowired_attributes(type(inst))
+            if descriptor.batch
+            and descriptor.context is self.context
+            and descriptor._cached(inst) is _unset
+        ]
+        values = inst.container.get_many(
+            [(descriptor._get_interface(), descriptor.iname) for descriptor in pending],
+            context=self.context,
+        )
+        for descriptor, value in zip(pending, values):
+            descriptor._store(inst, value)
+
+        return self._cached(inst)
+
+    def _resolve_hint(self) -> None:
+        """
+        Resolve an `auto` interface from the type hints of the owner class.
+        The hints of a class are evaluated only once, on the first access of
+        any of its `auto` attributes, so that forward references need only
+        be defined by then.
+        """
+        if self.interface is None and self._owner is not None:
+            hints = _class_hints(self._owner)
+            for name in self.names:
+                if name in hints:
+                    self.interface = hints[name]
+                    break
+
+    def _get_interface(self) -> type:
+        self._resolve_hint()
         if self.interface is None:
             raise TypeError(
                 "Cannot use autowired with `auto` interface without "
                 "explicitly specifying the interface in a type hint."
             )
 
-        val = inst.container.get(
-            interface=self.interface,
-            name=self.iname,
-            context=self.context,
-        )
+        return self.interface
+
+    def _cached(self, inst: object) -> Any:
+        """
+        Get the service cached on the instance, or ``_unset``.
+        """
+        if self.slot is not None:
+            return getattr(inst, self.slot, _unset)
+
+        return vars(inst).get(self.names[0], _unset)
+
+    def _store(self, inst: object, val: Any) -> None:
+        """
+        Cache the resolved service on the instance: in the slot of the
+        descriptor if it has one, otherwise under all the names the
+        descriptor is assigned to.
+        """
+        if self.slot is not None:
+            setattr(inst, self.slot, val)
+            return
 
         for name in self.names:
             setattr(inst, name, val)
 
-        return val
-
     def __set_name__(self, owner, name):
-        self.names.append(name)
+        if name not in self.names:
+            self.names.append(name)
+
+        if self.interface is None and self._owner is None:
+            self._owner = owner
 
-        if self.interface is None:
-            hints = get_type_hints(owner)
-            self.interface = hints.get(name, None)
+
+_hints_by_class: "weakref.WeakKeyDictionary[type, dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _class_hints(cls: type) -> dict[str, Any]:
+    try:
+        return _hints_by_class[cls]
+    except KeyError:
+        pass
+
+    hints = _hints_by_class[cls] = get_type_hints(cls)
+    return hints
+
+
+_autowired_by_class: "weakref.WeakKeyDictionary[type, tuple[autowired, ...]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _autowired_attributes(cls: type) -> tuple[autowired, ...]:
+    """
+    Get the distinct autowired descriptors visible on the class, taking
+    overriding attributes in subclasses into account.
+    """
+    try:
+        return _autowired_by_class[cls]
+    except KeyError:
+        pass
+
+    visible: dict[str, autowired] = {}
+    for klass in reversed(cls.__mro__):
+        for attribute, value in vars(klass).items():
+            if isinstance(value, autowired):
+                visible[attribute] = value
+            else:
+                visible.pop(attribute, None)
+
+    descriptors = tuple(dict.fromkeys(visible.values()))
+    _autowired_by_class[cls] = descriptors
+    return descriptors
+
+
+def autowired_slots(cls: type[T]) -> type[T]:
+    """
+    A class decorator that makes the `autowired` attributes of a class with
+    ``__slots__`` usable, by recreating the class with an additional slot
+    for each autowired attribute defined in it.
+
+    .. code-block:: python
+
+        @autowired_slots
+        class Foo:
+            __slots__ = ("container",)
+
+            bar: Bar = autowired(auto)
+
+    Apply the decorator directly to the class, below any other decorators
+    such as `service`.
+    """
+    namespace = dict(vars(cls))
+    if "__slots__" not in namespace:
+        raise TypeError(f"{cls.__qualname__} does not define __slots__")
+
+    slots = namespace["__slots__"]
+    slots = (slots,) if isinstance(slots, str) else tuple(slots)
+    added = []
+    for attribute, value in namespace.items():
+        if isinstance(value, autowired) and value.slot is None:
+            value.slot = f"_autowired_{attribute}"
+            added.append(value.slot)
+
+    for slot in slots:
+        namespace.pop(slot, None)
+
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = slots + tuple(added)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+
+    # rebind the ``__class__`` cell of methods that use zero-argument super()
+    for value in namespace.values():
+        if isinstance(value, (classmethod, staticmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            value = value.fget
+
+        for cell in getattr(value, "__closure__", None) or ():
+            try:
+                if cell.cell_contents is cls:
+                    cell.cell_contents = new_cls
+            except ValueError:  # pragma: no cover - empty cell
+                pass
+
+    return new_cls
 
 
 class _ContextDiscriminator(dict[type | None, Factory]):
@@ -183,29 +440,339 @@ class _AdapterRegistry:
             self.by_type_and_name[interface, name][context_type] = factory
 
 
+class _Registration(NamedTuple):
+    factory: Factory
+    disposer: Disposer | None
+
+
+class _ResolutionPlan(NamedTuple):
+    """
+    A compiled resolution of an (interface, name, context type) triple
+    across a container chain: the index of the container owning the factory,
+    the factory and its disposer, and whether the owning container receives
+    the context.
+    """
+
+    depth: int
+    factory: Factory
+    disposer: Disposer | None
+    use_context: bool
+
+
+class _PlanTable(dict[tuple[type, str, type | None], _ResolutionPlan]):
+    generation: int = 0
+
+
+# guards the plan tables and the dependency bookkeeping between registries.
+# Only taken when registries are mutated or when a plan is compiled.
+_plan_lock = threading.RLock()
+
+
 class FactoryRegistry:
+    version: int
+    _plan_tables: dict[tuple["FactoryRegistry", ...], _PlanTable]
+    _dependents: "weakref.WeakSet[FactoryRegistry]"
+    _misses: set[tuple[type, str, type | None]]
+    disposers: dict[tuple[type, str, type | None], Disposer]
+    pools: dict[tuple[type, str, type | None], ServicePool]
+    after_fork_hooks: dict[tuple[type, str, type | None], Callable[[Any], Any]]
+    observers: list[ResolutionObserver]
+    _frozen: dict[tuple[type, str, type | None], _Registration] | None
+
     def __init__(self, scope: str, supports_contexts: bool = False):
         self.scope = scope
         self.registry = _AdapterRegistry()
         self.supports_contexts = supports_contexts
+        self.disposers = {}
+        self.pools = {}
+        self.after_fork_hooks = {}
+        self.observers = []
+        self.version = 0
+        self._plan_tables = {}
+        self._dependents = weakref.WeakSet()
+        self._misses = set()
+        self._frozen = None
+        fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        self.registry.lock = threading.RLock()
+
+    def _after_fork_hook(
+        self, interface: type, name: str, context: Any
+    ) -> Callable[[Any], Any] | None:
+        """
+        Get the after-fork hook of the factory that `_lookup` finds for the
+        context.
+        """
+        discriminator = self.registry.by_type_and_name.get((interface, name), {})
+        mro = (None,) if context is None else type(context).__mro__
+        for context_type in mro:
+            if context_type in discriminator:
+                return self.after_fork_hooks.get((interface, name, context_type))
+
+        return None
+
+    @property
+    def frozen(self) -> bool:
+        """
+        Whether the registry has been frozen with `freeze`.
+        """
+        return self._frozen is not None
+
+    def freeze(self) -> None:
+        """
+        Make the registry immutable. The registrations are flattened into a
+        single lookup table that is read without locking, and registering
+        factories afterwards raises a RuntimeError. Freezing a frozen
+        registry does nothing.
+        """
+        with _plan_lock, self.registry.lock:
+            if self._frozen is not None:
+                return
+
+            self._frozen = {
+                (interface, name, context_type): _Registration(
+                    factory,
+                    self.disposers.get((interface, name, context_type)),
+                )
+                for (
+                    interface,
+                    name,
+                ), discriminator in self.registry.by_type_and_name.items()
+                for context_type, factory in discriminator.items()
+            }
+
+    def _check_not_frozen(self) -> None:
+        if self._frozen is not None:
+            raise RuntimeError(f"FactoryRegistry({self.scope}) is frozen")
+
+    def _changed(self) -> None:
+        """
+        Bump the registry version and throw away every compiled resolution
+        plan that could have consulted this registry.
+        """
+        with _plan_lock:
+            self.version += 1
+            self._misses.clear()
+            self._clear_plans()
+            for dependent in list(self._dependents):
+                dependent._clear_plans()
+
+    def _clear_plans(self) -> None:
+        for table in self._plan_tables.values():
+            table.generation += 1
+            table.clear()
+
+    def _lookup(self, interface: type, name: str, context: Any) -> _Registration | None:
+        """
+        Find the factory and disposer for the context type or its closest
+        base type. A miss is remembered until the registry is changed, so
+        that lookups of services registered only in parent scopes do not
+        walk the MRO again.
+        """
+        key = interface, name, None if context is None else type(context)
+        if key in self._misses:
+            return None
+
+        mro = (None,) if context is None else type(context).__mro__
+        frozen = self._frozen
+        if frozen is not None:
+            for context_type in mro:
+                registration = frozen.get((interface, name, context_type))
+                if registration is not None:
+                    return registration
+
+            self._misses.add(key)
+            return None
+
+        version = self.version
+        for context_type in mro:
+            try:
+                factory = self.resolve(
+                    interface=interface,
+                    name=name,
+                    context_type=context_type,
+                )
+            except KeyError:
+                continue
+
+            disposer = self.disposers.get((interface, name, context_type))
+            return _Registration(factory, disposer)
+
+        with _plan_lock:
+            if self.version == version:
+                self._misses.add(key)
+
+        return None
+
+    def _get_plan_table(self, parents: tuple["FactoryRegistry", ...]) -> _PlanTable:
+        """
+        Get the table of compiled plans for containers of this registry whose
+        parent containers use the given registries, outermost last.
+        """
+        table = self._plan_tables.get(parents)
+        if table is not None:
+            return table
+
+        with _plan_lock:
+            table = self._plan_tables.get(parents)
+            if table is None:
+                table = self._plan_tables[parents] = _PlanTable()
+                for parent in parents:
+                    parent._dependents.add(self)
+
+            return table
 
     def register(
         self,
         *,
         interface: type = object,
         name: str = "",
-        factory: Factory,
+        factory: Factory | str,
         context_type: type | None = None,
+        disposer: Disposer | str | None = None,
+        after_fork: Callable[[Any], Any] | str | None = None,
     ):
+        """
+        Register a factory.
+
+        :param interface: The interface to register the factory for
+        :param name: The name to register the factory under
+        :param factory: The factory, or its dotted name (e.g.
+           ``"package.module:Factory"``). A factory given by name is imported
+           when the service is first constructed.
+        :param context_type: The context type to register the factory for.
+           The registry must support contexts if specified.
+        :param disposer: A callable that is called with the service when the
+           container that created it is closed, or its dotted name
+        :param after_fork: A callable that is called with the service in a
+           forked child process, if the service was constructed before the
+           fork, or its dotted name; see `anemic.ioc.fork`
+        """
         if not self.supports_contexts and context_type is not None:
             raise TypeError(f"FactoryRegistry({self.scope}) does not support contexts")
 
+        self._check_not_frozen()
+        factory = _lazy(factory)
+        disposer = _lazy(disposer)
+        after_fork = _lazy(after_fork)
+
         self.registry.set(
             interface=interface,
             name=name,
             context_type=context_type,
             factory=factory,
         )
+        if disposer is not None:
+            self.disposers[interface, name, context_type] = disposer
+        else:
+            self.disposers.pop((interface, name, context_type), None)
+
+        if after_fork is not None:
+            self.after_fork_hooks[interface, name, context_type] = after_fork
+        else:
+            self.after_fork_hooks.pop((interface, name, context_type), None)
+
+        self.pools.pop((interface, name, context_type), None)
+        self._changed()
+
+    def register_pooled(
+        self,
+        *,
+        interface: type = object,
+        name: str = "",
+        factory: Factory | str,
+        context_type: type | None = None,
+        max_size: int,
+        overflow: bool = False,
+        timeout: float | None = None,
+        reset: Callable[[Any], Any] | None = None,
+        dispose: Callable[[Any], Any] | None = None,
+    ) -> ServicePool:
+        """
+        Register a pooled factory. The containers of this scope check an
+        instance out of a `ServicePool` shared by all of them when the
+        service is first requested, and return it to the pool when they are
+        closed. The pool, and its statistics, is available as the return
+        value and in `pools`.
+
+        The other parameters are those of `register` and `ServicePool`.
+        """
+        pool = ServicePool(
+            _lazy(factory),
+            max_size=max_size,
+            overflow=overflow,
+            timeout=timeout,
+            reset=reset,
+            dispose=dispose,
+        )
+        self.register(
+            interface=interface,
+            name=name,
+            factory=pool.checkout,
+            context_type=context_type,
+            disposer=pool.checkin,
+        )
+        self.pools[interface, name, context_type] = pool
+        return pool
+
+    def register_in_processes(
+        self,
+        *,
+        interface: type = object,
+        name: str = "",
+        factory: Factory | str,
+        bootstrap: str,
+        scopes: Sequence[str] | None = None,
+        max_workers: int | None = None,
+        mp_context: Any = None,
+    ) -> None:
+        """
+        Register a service that runs in a pool of worker processes, for
+        CPU bound work. Containers resolve the service as a `ProcessProxy`
+        whose method calls are executed in the workers; the workers are
+        shut down when the container that created the proxy is closed.
+
+        Each worker calls ``bootstrap`` to build the registry set of the
+        application, which is expected to make this same registration; in
+        the workers it registers the `factory` itself.
+
+        :param interface: The interface to register the service for
+        :param name: The name to register the service under
+        :param factory: The factory of the service, or its dotted name
+        :param bootstrap: The dotted name of a callable that returns the
+           `FactoryRegistrySet` to resolve the service from in the workers
+        :param scopes: The scopes of the containers that are created in the
+           workers, outermost first; by default the scope of this registry
+        :param max_workers: The number of worker processes
+        :param mp_context: The multiprocessing context to start the workers
+           with
+        """
+        from .processes import ProcessProxy, in_worker
+
+        if in_worker():
+            self.register(interface=interface, name=name, factory=factory)
+            return
+
+        worker_scopes = tuple(scopes) if scopes is not None else (self.scope,)
+
+        def create_proxy(container: "Container") -> "ProcessProxy":
+            return ProcessProxy(
+                interface,
+                name,
+                bootstrap=bootstrap,
+                scopes=worker_scopes,
+                max_workers=max_workers,
+                mp_context=mp_context,
+            )
+
+        self.register(
+            interface=interface,
+            name=name,
+            factory=create_proxy,
+            disposer=ProcessProxy.shutdown,
+            after_fork=ProcessProxy._after_fork,
+        )
 
     def register_singleton(
         self,
@@ -218,12 +785,17 @@ class FactoryRegistry:
         if not self.supports_contexts and context_type is not None:
             raise TypeError(f"FactoryRegistry({self.scope}) does not support contexts")
 
+        self._check_not_frozen()
         self.registry.set(
             interface=interface,
             name=name,
             context_type=context_type,
             factory=lambda _: singleton,
         )
+        self.disposers.pop((interface, name, context_type), None)
+        self.after_fork_hooks.pop((interface, name, context_type), None)
+        self.pools.pop((interface, name, context_type), None)
+        self._changed()
 
     def resolve(
         self,
@@ -276,9 +848,25 @@ class FactoryRegistrySet:
     """
 
     _registries: dict[str, FactoryRegistry]
+    _observers: list[ResolutionObserver]
+    _scanned: list[manifest.ManifestEntry]
+    _scanned_packages: list[str]
 
     def __init__(self):
         self._registries = {}
+        self._observers = []
+        self._scanned = []
+        self._scanned_packages = []
+        self.frozen = False
+
+    def freeze(self) -> None:
+        """
+        Freeze all the registries in the set (see `FactoryRegistry.freeze`).
+        Registries cannot be added to a frozen set.
+        """
+        self.frozen = True
+        for registry in self._registries.values():
+            registry.freeze()
 
     def create_registry(
         self, scope: str, supports_contexts: bool = False
@@ -291,13 +879,40 @@ class FactoryRegistrySet:
         :param supports_contexts: Whether the registry supports contexts
         :return: The created registry
         """
+        if self.frozen:
+            raise RuntimeError("FactoryRegistrySet is frozen")
+
         if scope in self._registries:
             raise KeyError(f"Registry for scope {scope!r} already exists")
 
         registry = FactoryRegistry(scope, supports_contexts)
+        registry.observers.extend(self._observers)
         self._registries[scope] = registry
         return registry
 
+    def add_observer(self, observer: ResolutionObserver) -> None:
+        """
+        Attach an observer to all the registries of the set, including those
+        created later. The observer receives the resolution events of the
+        containers created for the registries after this call.
+
+        :param observer: The observer to add
+        """
+        self._observers.append(observer)
+        for registry in self._registries.values():
+            registry.observers.append(observer)
+
+    def remove_observer(self, observer: ResolutionObserver) -> None:
+        """
+        Detach an observer added with `add_observer`. Containers created
+        before this call keep reporting to the observer.
+
+        :param observer: The observer to remove
+        """
+        self._observers.remove(observer)
+        for registry in self._registries.values():
+            registry.observers.remove(observer)
+
     def get_registry(self, scope: str) -> FactoryRegistry:
         """
         Get a registry for a scope. If a registry for the scope does not exist,
@@ -336,6 +951,7 @@ class FactoryRegistrySet:
            None. See :py:meth:`venusian.Scanner.scan` for more information
 
         """
+        venusian = _import_venusian()
         if venusian is None:
             raise RuntimeError(
                 "Venusian is not installed but it is required for scanning"
@@ -349,6 +965,51 @@ class FactoryRegistrySet:
             onerror=onerror,
             ignore=ignore,
         )
+        self._scanned_packages.append(package.__name__)
+
+    def write_manifest(self, path: str | os.PathLike | IO[str]) -> None:
+        """
+        Write the service registrations made by the `service` decorators
+        found by `scan_services` to a manifest file, so that later processes
+        can register the services with `load_manifest` instead of scanning.
+        All registered objects must be importable by their dotted names.
+
+        :param path: The path of the manifest file, or a text stream
+        """
+        if hasattr(path, "write"):
+            manifest.write_manifest(path, self._scanned, self._scanned_packages)
+            return
+
+        with open(path, "w") as stream:
+            manifest.write_manifest(stream, self._scanned, self._scanned_packages)
+
+    def load_manifest(
+        self,
+        path: str | os.PathLike | IO[str],
+        *,
+        check_mtimes: bool = False,
+    ) -> None:
+        """
+        Register the services listed in a manifest written by
+        `write_manifest`. The registries for the scopes must exist.
+
+        :param path: The path of the manifest file, or a text stream
+        :param check_mtimes: If true, raise a RuntimeError when a module of
+           the scanned packages has been changed or removed after the
+           manifest was written
+        """
+        if hasattr(path, "read"):
+            registrations = manifest.read_manifest(path, check_mtimes=check_mtimes)
+        else:
+            with open(path) as stream:
+                registrations = manifest.read_manifest(
+                    stream, check_mtimes=check_mtimes
+                )
+
+        for registration in registrations:
+            self.get_registry(registration["scope"]).register(
+                **manifest.resolve_registration(registration)
+            )
 
     def dump(self, indent: int = 0, stream: IO[str] | None = None) -> None:
         """
@@ -367,12 +1028,81 @@ class FactoryRegistrySet:
             registry.dump(indent + 4, stream=stream)
 
 
+class _InFlight:
+    """
+    A service that is being constructed by the thread `owner`. The `done`
+    lock is held until the construction finishes.
+    """
+
+    __slots__ = ("owner", "done", "service", "error")
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.done = threading.Lock()
+        self.done.acquire()
+        self.service: Any = None
+        self.error: BaseException | None = None
+
+    def set_result(self, service: Any) -> None:
+        self.service = service
+        self.done.release()
+
+    def set_exception(self, error: BaseException) -> None:
+        self.error = error
+        self.done.release()
+
+    def result(self) -> Any:
+        with self.done:
+            pass
+
+        if self.error is not None:
+            raise self.error
+
+        return self.service
+
+
+# the locks guarding the construction of services in all service caches.
+# A key is always guarded by the same stripe, so that unrelated services do
+# not contend for a single lock.
+_STRIPE_COUNT = 64
+_stripes = tuple(threading.Lock() for _ in range(_STRIPE_COUNT))
+
+
+def _stripe_for(key: tuple[type, str]) -> threading.Lock:
+    return _stripes[hash(key) % _STRIPE_COUNT]
+
+
+# a lock held by another thread at the time of a fork is never released in
+# the child
+@fork._reinit_after_fork
+def _reinit_module_locks() -> None:
+    global _plan_lock, _stripes
+    _plan_lock = threading.RLock()
+    _stripes = tuple(threading.Lock() for _ in range(_STRIPE_COUNT))
+
+
 class _ServiceCache:
-    lock: threading.RLock
+    """
+    The services of a container for one context. A service is published
+    into `cache` exactly once, after it has been constructed, and is never
+    replaced; reads therefore take no lock. Constructing a service takes the
+    lock stripe of its key only to claim or join the construction.
+
+    Synchronous and asynchronous constructions share `in_flight`; a
+    service being constructed by a task of an `AsyncContainer` is an
+    `_AsyncInFlight` there.
+    """
+
+    in_flight: dict[tuple[type, str], Any]
 
     def __init__(self):
         self.cache = {}
-        self.lock = threading.RLock()
+        self.in_flight = {}
+
+    def _reinit_after_fork(self) -> None:
+        # the threads and event loops constructing these do not exist in the
+        # child; the services are constructed again on the next request
+        self.in_flight = {}
 
     def get(
         self,
@@ -380,44 +1110,200 @@ class _ServiceCache:
         interface: type = object,
         name: str = "",
     ):
-        with self.lock:
-            return self.cache[interface, name]
+        return self.cache[interface, name]
 
-    def set(
+    def get_or_create(
         self,
         *,
         interface: type = object,
         name: str = "",
-        service: Any,
+        factory: Factory,
+        container: "Container",
+        disposer: Disposer | None = None,
     ):
-        with self.lock:
-            self.cache[interface, name] = service
+        """
+        Get the cached service, or construct it by calling
+        ``factory(container)``. Only one thread constructs a given service at
+        a time; other threads requesting the same service wait for it without
+        holding any lock, and receive the same service or exception.
+
+        If `disposer` is given, the constructed service is disposed of when
+        the container is closed.
+        """
+        key = interface, name
+        stripe = _stripe_for(key)
+        with stripe:
+            try:
+                return self.cache[key]
+            except KeyError:
+                pass
+
+            flight = self.in_flight.get(key)
+            if flight is None:
+                flight = self.in_flight[key] = _InFlight()
+                constructing = True
+            else:
+                constructing = False
+
+        if not constructing:
+            if not isinstance(flight, _InFlight):
+                raise RuntimeError(
+                    f"{interface.__name__} named {name!r} is being constructed "
+                    f"asynchronously; resolve it with `await container.aget(...)`"
+                )
+
+            if flight.owner == threading.get_ident():
+                raise RuntimeError(
+                    f"Circular dependency while constructing "
+                    f"{interface.__name__} named {name!r}"
+                )
+
+            return flight.result()
+
+        try:
+            service = factory(container)
+        except BaseException as e:
+            with stripe:
+                del self.in_flight[key]
+
+            flight.set_exception(e)
+            raise
+
+        with stripe:
+            service = self._publish(key, service, container, disposer)
+            del self.in_flight[key]
+
+        flight.set_result(service)
+        return service
+
+    def _publish(
+        self,
+        key: tuple[type, str],
+        service: Any,
+        container: "Container",
+        disposer: Disposer | None,
+    ) -> Any:
+        """
+        Publish a constructed service, with the lock stripe of `key` held.
+        A published service is never replaced; the published one is returned.
+        """
+        published = self.cache.setdefault(key, service)
+        if published is service and disposer is not None:
+            container._disposables.append((service, disposer))
+
+        return published
+
+
+class ContextCacheInfo(NamedTuple):
+    """
+    Statistics of the per-context service caches of a container.
+    """
+
+    contexts: int
+    max_contexts: int | None
+    evictions: int
+
+
+class WarmUpTiming(NamedTuple):
+    """
+    The time it took to resolve a service in `Container.warm_up`.
+    """
+
+    interface: type
+    name: str
+    seconds: float
+
+
+class _ContextEntry(NamedTuple):
+    ref: weakref.ref
+    services: _ServiceCache
 
 
 class _ContextServiceCache:
-    lock: threading.RLock
+    """
+    Service caches keyed by context object identity. Each context is
+    registered once with a weak reference that removes its cache when the
+    context dies; the weak reference is also used to detect a stale entry
+    left behind by a recycled ``id()``. If `max_contexts` is set, the least
+    recently used context caches are evicted when the limit is exceeded.
+    """
 
-    def __init__(self):
-        self.cache = {}
-        self.lock = threading.RLock()
+    lock: "threading.RLock | None"
+    cache: "OrderedDict[int, _ContextEntry]"
+
+    def __init__(
+        self,
+        max_contexts: int | None = None,
+        supports_contexts: bool = True,
+    ):
+        self.no_context = _ServiceCache()
+        self.cache = OrderedDict()
+        # containers whose registry does not support contexts only ever
+        # use the cache of the None context, and do not need the lock
+        self.lock = threading.RLock() if supports_contexts else None
+        self.max_contexts = max_contexts
+        self.evictions = 0
 
     def get(
         self,
         *,
         context: Any,
     ):
+        if context is None:
+            return self.no_context
+
         id_ = id(context)
         with self.lock:
+            entry = self.cache.get(id_)
+            if entry is not None and entry.ref() is context:
+                self.cache.move_to_end(id_)
+                return entry.services
+
+            try:
+                ref = weakref.ref(context, self._make_remover(id_))
+            except TypeError:
+                raise TypeError(f"Context {context} is not weakly referenceable")
+
+            entry = self.cache[id_] = _ContextEntry(ref, _ServiceCache())
+            self.cache.move_to_end(id_)
+            if self.max_contexts is not None:
+                while len(self.cache) > self.max_contexts:
+                    self.cache.popitem(last=False)
+                    self.evictions += 1
+
+            return entry.services
+
+    def _make_remover(self, id_: int) -> Callable[[weakref.ref], None]:
+        def remove(ref: weakref.ref) -> None:
+            with self.lock:
+                entry = self.cache.get(id_)
+                if entry is not None and entry.ref is ref:
+                    del self.cache[id_]
+
+        return remove
+
+    def info(self) -> ContextCacheInfo:
+        return ContextCacheInfo(len(self.cache), self.max_contexts, self.evictions)
+
+    def items(self) -> list[tuple[Any, _ServiceCache]]:
+        """
+        Get the live contexts and their service caches, the None context
+        first.
+        """
+        items = [(None, self.no_context)]
+        for entry in list(self.cache.values()):
+            context = entry.ref()
             if context is not None:
-                try:
-                    weakref.finalize(context, self.cache.pop, id_, None)
-                except TypeError:
-                    raise TypeError(f"Context {context} is not weakly referenceable")
+                items.append((context, entry.services))
 
-            if id_ not in self.cache:
-                self.cache[id_] = _ServiceCache()
+        return items
 
-            return self.cache[id_]
+    def _reinit_after_fork(self) -> None:
+        if self.lock is not None:
+            self.lock = threading.RLock()
+
+        for _, services in self.items():
+            services._reinit_after_fork()
 
 
 class Container:
@@ -429,11 +1315,20 @@ class Container:
     """
 
     context_caches: _ContextServiceCache
+    closed: bool
+    observer: ResolutionObserver | None
+    _chain: tuple["Container", ...]
+    _plans: _PlanTable
+    _disposables: list[tuple[Any, Disposer]]
+    # the results of `container_memoize` methods, created on first use
+    _memo_caches: dict[Any, Any] | None = None
 
     def __init__(
         self,
         factory_registry: FactoryRegistry,
         parent: "Container | None" = None,
+        *,
+        max_contexts: int | None = None,
     ):
         """
         Create a new container.
@@ -441,18 +1336,297 @@ class Container:
         :param factory_registry: The registry to resolve services from
         :param parent: The parent container to resolve services from if they
         are not registered in this container
+        :param max_contexts: The maximum number of contexts to keep service
+        caches for. The least recently used context is evicted when the
+        limit is exceeded. If not specified, the caches live as long as the
+        contexts themselves.
         """
         self.factory_registry = factory_registry
-        self.context_caches = _ContextServiceCache()
+        self.context_caches = _ContextServiceCache(
+            max_contexts, factory_registry.supports_contexts
+        )
         self.scope = factory_registry.scope
         self.parent = parent
+        self.closed = False
+        self._disposables = []
+        self._observers = list(factory_registry.observers)
+        self.observer = _combine(self._observers)
+
+        self._chain = (self,) + (parent._chain if parent is not None else ())
+        self._plans = factory_registry._get_plan_table(
+            tuple(container.factory_registry for container in self._chain[1:])
+        )
+        # request scoped containers are rarely alive at a fork, and are not
+        # worth the weak reference; those that are belong to the parent's
+        # requests and must not be used in the child, see `fork`
+        if parent is None or factory_registry.after_fork_hooks:
+            fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        self.context_caches._reinit_after_fork()
+
+    def _run_after_fork_hooks(self) -> None:
+        registry = self.factory_registry
+        if not registry.after_fork_hooks:
+            return
+
+        for context, services in self.context_caches.items():
+            for (interface, name), service in list(services.cache.items()):
+                hook = registry._after_fork_hook(interface, name, context)
+                if hook is None:
+                    continue
+
+                try:
+                    hook(service)
+                except Exception:
+                    logger.exception("Error in the after-fork hook of %r", service)
+
+    def add_observer(self, observer: ResolutionObserver) -> None:
+        """
+        Attach an observer that receives the resolution events of this
+        container.
+
+        :param observer: The observer to add
+        """
+        self._observers.append(observer)
+        self.observer = _combine(self._observers)
+
+    def remove_observer(self, observer: ResolutionObserver) -> None:
+        """
+        Detach an observer from this container.
+
+        :param observer: The observer to remove
+        """
+        self._observers.remove(observer)
+        self.observer = _combine(self._observers)
+
+    def __enter__(self) -> "Container":
+        return self
 
-    def _get_mro(self, context_object):
-        if context_object is None:
-            return [None]
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-        mro = list(type(context_object).__mro__)
-        return mro
+    async def __aenter__(self) -> "Container":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _begin_close(self) -> list[tuple[Any, Disposer]]:
+        self.closed = True
+        self.context_caches = _ContextServiceCache(
+            self.context_caches.max_contexts, self.factory_registry.supports_contexts
+        )
+        vars(self).pop("_memo_caches", None)
+        disposables, self._disposables = self._disposables, []
+        disposables.reverse()
+        return disposables
+
+    def close(self) -> None:
+        """
+        Close the container: call the disposers of the services it has
+        created, in reverse creation order, and drop its cached services.
+        Parent containers are not closed. All disposers are called even if
+        some of them fail; the first exception is re-raised afterwards.
+
+        A closed container cannot construct new services. Closing a request
+        scoped container, e.g. from a Pyramid finished callback, returns the
+        resources held by its services as soon as the response is done.
+        """
+        first_error: Exception | None = None
+        for service, disposer in self._begin_close():
+            try:
+                result = disposer(service)
+                if hasattr(result, "__await__"):
+                    getattr(result, "close", lambda: None)()
+                    raise TypeError(
+                        f"Disposer {disposer!r} is asynchronous; close the "
+                        f"container with `await container.aclose()`"
+                    )
+            except Exception as e:
+                logger.exception("Error disposing %r", service)
+                if first_error is None:
+                    first_error = e
+
+        if first_error is not None:
+            raise first_error
+
+    async def aclose(self) -> None:
+        """
+        Close the container like `close`, awaiting the disposers that return
+        awaitables.
+        """
+        first_error: Exception | None = None
+        for service, disposer in self._begin_close():
+            try:
+                result = disposer(service)
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                logger.exception("Error disposing %r", service)
+                if first_error is None:
+                    first_error = e
+
+        if first_error is not None:
+            raise first_error
+
+    def warm_up(
+        self,
+        *,
+        scope: str | None = None,
+        max_workers: int | None = None,
+    ) -> list[WarmUpTiming]:
+        """
+        Construct all the services registered without a context type in the
+        registry of the given scope ahead of time, in a thread pool. A service
+        is constructed only after those of its `autowired` dependencies that
+        are registered in the same scope; independent services are
+        constructed in parallel.
+
+        If a factory raises an exception, no more services are started and
+        the exception is re-raised once the running ones have finished.
+
+        :param scope: The scope of the container in this container's chain to
+           warm up. Defaults to the scope of this container.
+        :param max_workers: The maximum number of threads to use
+        :return: The time it took to resolve each service, in completion
+           order
+        """
+        container = self
+        if scope is not None:
+            for container in self._chain:
+                if container.scope == scope:
+                    break
+            else:
+                raise LookupError(f"No container for scope {scope!r} in the chain")
+
+        registrations = container.factory_registry.registry.by_type_and_name
+        pending: dict[tuple[type, str], set[tuple[type, str]]] = {}
+        for key, discriminator in list(registrations.items()):
+            if None not in discriminator:
+                continue
+
+            factory = discriminator[None]
+            if isinstance(factory, _LazyCallable):
+                factory = factory.resolve()
+
+            pending[key] = set()
+            if isinstance(factory, type):
+                for descriptor in _autowired_attributes(factory):
+                    descriptor._resolve_hint()
+                    if descriptor.interface is not None:
+                        pending[key].add((descriptor.interface, descriptor.iname))
+
+        for dependencies in pending.values():
+            dependencies &= pending.keys()
+
+        def build(key: tuple[type, str]) -> WarmUpTiming:
+            interface, name = key
+            start = time.perf_counter()
+            container.get(interface=interface, name=name)
+            return WarmUpTiming(interface, name, time.perf_counter() - start)
+
+        from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+        timings: list[WarmUpTiming] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running: dict[Future, tuple[type, str]] = {}
+            error: BaseException | None = None
+            while pending or running:
+                if error is None:
+                    ready = [key for key, deps in pending.items() if not deps]
+                    if not ready and not running:
+                        # a dependency cycle: construct the rest sequentially
+                        # so that no two threads wait for each other
+                        timings.extend(build(key) for key in pending)
+                        break
+
+                    for key in ready:
+                        del pending[key]
+                        running[executor.submit(build, key)] = key
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        timings.append(future.result())
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+
+                        continue
+
+                    for dependencies in pending.values():
+                        dependencies.discard(key)
+
+            if error is not None:
+                raise error
+
+        return timings
+
+    def context_cache_info(self) -> ContextCacheInfo:
+        """
+        Get the statistics of the per-context service caches of this
+        container.
+        """
+        return self.context_caches.info()
+
+    def _compile_plan(
+        self,
+        key: tuple[type, str, type | None],
+        context: Any,
+    ) -> _ResolutionPlan:
+        """
+        Walk the container chain and the context MRO to find the factory for
+        the key, and memoize the result for all containers sharing the same
+        registry chain. The plan is discarded when any registry in the chain
+        is changed.
+        """
+        interface, name, _ = key
+        original_context = context
+        generation = self._plans.generation
+
+        for depth, container in enumerate(self._chain):
+            registry = container.factory_registry
+            if not registry.supports_contexts:
+                context = None
+
+            registration = registry._lookup(interface, name, context)
+            if registration is None:
+                continue
+
+            plan = _ResolutionPlan(
+                depth,
+                registration.factory,
+                registration.disposer,
+                context is not None,
+            )
+            if all(c.factory_registry._frozen is not None for c in self._chain):
+                # plans of a frozen chain are never invalidated
+                self._plans[key] = plan
+            else:
+                with _plan_lock:
+                    if self._plans.generation == generation:
+                        self._plans[key] = plan
+
+            return plan
+
+        name_part = ""
+        if name:
+            name_part = f" named {name!r}"
+
+        context_part = ""
+        if original_context:
+            context_part = f" (in context {original_context!r})"
+
+        raise LookupError(
+            f"Could not resolve a factory for {interface.__name__}"
+            f"{name_part}"
+            f"{context_part}"
+        )
 
     def get(
         self,
@@ -472,10 +1646,10 @@ class Container:
         :param context: The context to resolve the service for
         :return: The resolved service
         """
-        if not self.factory_registry.supports_contexts:
-            context = None
+        if self.observer is not None:
+            return self._observed_get(interface, name, context)
 
-        context_cache = self.context_caches.get(context=context)
+        owner, plan, context_cache = self._locate(interface, name, context)
         try:
             return context_cache.get(
                 interface=interface,
@@ -484,47 +1658,207 @@ class Container:
         except KeyError:
             pass
 
-        for context_type in self._get_mro(context):
-            try:
-                factory = self.factory_registry.resolve(
-                    interface=interface,
-                    name=name,
-                    context_type=context_type,
+        owner._check_open()
+        return context_cache.get_or_create(
+            interface=interface,
+            name=name,
+            factory=self._sync_factory(plan.factory),
+            container=owner,
+            disposer=plan.disposer,
+        )
+
+    def get_many(
+        self,
+        requests: Iterable[tuple[type, str] | type],
+        *,
+        context: Any = None,
+    ) -> tuple[Any, ...]:
+        """
+        Resolve several services at once. The context service cache of each
+        container involved is looked up only once, and cached services are
+        read without any locking.
+
+        .. code-block:: python
+
+            engine, cache = container.get_many([Engine, (Cache, "local")])
+
+        :param requests: The services to resolve, as interfaces or
+           (interface, name) tuples
+        :param context: The context to resolve the services for
+        :return: The resolved services, in the order of the requests
+        """
+        requests = [
+            request if isinstance(request, tuple) else (request, "")
+            for request in requests
+        ]
+        if self.observer is not None:
+            return tuple(
+                self._observed_get(interface, name, context)
+                for interface, name in requests
+            )
+
+        if context is None or not self.factory_registry.supports_contexts:
+            context = None
+            context_type = None
+        else:
+            context_type = type(context)
+
+        plans = self._plans
+        chain = self._chain
+        caches: dict[tuple[int, bool], _ServiceCache] = {}
+        services = []
+        for interface, name in requests:
+            key = interface, name, context_type
+            plan = plans.get(key)
+            if plan is None:
+                plan = self._compile_plan(key, context)
+
+            cache_key = plan.depth, plan.use_context
+            context_cache = caches.get(cache_key)
+            owner = chain[plan.depth]
+            if context_cache is None:
+                context_cache = caches[cache_key] = owner.context_caches.get(
+                    context=context if plan.use_context else None
                 )
-                service = factory(self)
-                context_cache.set(
+
+            try:
+                services.append(context_cache.cache[interface, name])
+                continue
+            except KeyError:
+                pass
+
+            owner._check_open()
+            services.append(
+                context_cache.get_or_create(
                     interface=interface,
                     name=name,
-                    service=service,
+                    factory=self._sync_factory(plan.factory),
+                    container=owner,
+                    disposer=plan.disposer,
                 )
-                return service
-            except KeyError:
-                pass
+            )
+
+        return tuple(services)
+
+    def provides(
+        self,
+        *,
+        interface: type = object,
+        name: str = "",
+        context: Any = None,
+    ) -> bool:
+        """
+        Whether a factory for the service is registered in the registry of
+        this container or of one of its parents. The service is not
+        constructed.
+
+        :param interface: The interface of the service
+        :param name: The name of the service
+        :param context: The context to resolve the service for
+        """
+        if context is None or not self.factory_registry.supports_contexts:
+            key = (interface, name, None)
+        else:
+            key = (interface, name, type(context))
+
+        if key in self._plans:
+            return True
+
+        try:
+            self._compile_plan(key, context)
+        except LookupError:
+            return False
+
+        return True
 
-        if self.parent is not None:
-            return self.parent.get(
+    def _sync_factory(self, factory: Factory) -> Factory:
+        """
+        Adapt a factory for synchronous resolution with `get`.
+        """
+        return factory
+
+    def _observed_locate(
+        self,
+        observer: ResolutionObserver,
+        interface: type,
+        name: str,
+        context: Any,
+    ) -> tuple["Container", _ResolutionPlan, _ServiceCache]:
+        if context is not None and self.factory_registry.supports_contexts:
+            observer.context_resolved(self.scope, interface, name, type(context))
+
+        owner, plan, context_cache = self._locate(interface, name, context)
+        if owner is not self:
+            observer.parent_fallthrough(self.scope, interface, name, owner.scope)
+
+        return owner, plan, context_cache
+
+    def _observed_get(self, interface: type, name: str, context: Any):
+        observer = self.observer
+        owner, plan, context_cache = self._observed_locate(
+            observer, interface, name, context
+        )
+        try:
+            service = context_cache.get(
                 interface=interface,
                 name=name,
-                context=context,
             )
+        except KeyError:
+            pass
         else:
-            reported: Any = interface
-            if interface is object:
-                reported = Any
-
-            name_part = ""
-            if name:
-                name_part = f" named {name!r}"
-
-            context_part = ""
-            if context:
-                context_part = f" (in context {context!r})"
-
-            raise LookupError(
-                f"Could not resolve a factory for {interface.__name__}"
-                f"{name_part}"
-                f"{context_part}"
-            )
+            observer.cache_hit(owner.scope, interface, name)
+            return service
+
+        observer.cache_miss(owner.scope, interface, name)
+        owner._check_open()
+        factory = self._sync_factory(plan.factory)
+
+        def timed_factory(container: Container) -> Any:
+            start = time.perf_counter()
+            try:
+                return factory(container)
+            finally:
+                observer.factory_called(
+                    owner.scope, interface, name, time.perf_counter() - start
+                )
+
+        return context_cache.get_or_create(
+            interface=interface,
+            name=name,
+            factory=timed_factory,
+            container=owner,
+            disposer=plan.disposer,
+        )
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise RuntimeError(f"Container for scope {self.scope!r} is closed")
+
+    def _locate(
+        self,
+        interface: type,
+        name: str,
+        context: Any,
+    ) -> tuple["Container", _ResolutionPlan, _ServiceCache]:
+        """
+        Find the container owning the factory for the service, the resolution
+        plan, and the owner's service cache for the context.
+        """
+        if context is None or not self.factory_registry.supports_contexts:
+            context = None
+            key = (interface, name, None)
+        else:
+            key = (interface, name, type(context))
+
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._compile_plan(key, context)
+
+        owner = self._chain[plan.depth]
+        if not plan.use_context:
+            context = None
+
+        return owner, plan, owner.context_caches.get(context=context)
 
 
 def service(
@@ -533,6 +1867,9 @@ def service(
     name: str = "",
     context_type: type | None = None,
     scope: str,
+    disposer: Disposer | str | None = None,
+    factory: Factory | str | None = None,
+    after_fork: Callable[[Any], Any] | str | None = None,
 ):
     """
     A decorator that registers a service factory in a registry.
@@ -546,6 +1883,15 @@ def service(
     registry must support contexts.
     :param scope: The scope to register the service under. The scope must be
     supported by the registry.
+    :param disposer: A callable that is called with the service when the
+    container that created it is closed, or its dotted name.
+    :param factory: The factory to register instead of the decorated object,
+    or its dotted name. This allows decorating a lightweight interface
+    class with a factory that is imported only when the service is first
+    constructed.
+    :param after_fork: A callable that is called with the service in a
+    forked child process if the service was constructed before the fork,
+    or its dotted name.
     """
     registration_name = name
 
@@ -565,14 +1911,31 @@ def service(
                 context_type,
                 scope,
             )
+            service_factory = ob if factory is None else factory
             registry.register(
                 interface=interface,
                 name=registration_name,
                 context_type=context_type,
-                factory=ob,
+                factory=service_factory,
+                disposer=disposer,
+                after_fork=after_fork,
             )
+            registry_set._scanned.append(
+                manifest.ManifestEntry(
+                    scope,
+                    interface,
+                    registration_name,
+                    context_type,
+                    service_factory,
+                    disposer,
+                    after_fork,
+                )
+            )
+
+        venusian = _import_venusian()
+        if venusian is not None:
+            venusian.attach(wrapped, callback, category="anemic.service")
 
-        venusian_attach(wrapped, callback, category="anemic.service")
         return wrapped
 
     return service_decorator
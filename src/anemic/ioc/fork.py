@@ -0,0 +1,85 @@
+"""
+Support for preforking servers, e.g. gunicorn with ``--preload``, that
+build the application, and some of its services, before forking the
+worker processes.
+
+In a forked child the locks of the registries and containers are replaced
+with new ones, since a lock held by another thread of the parent at the
+time of the fork would never be released in the child, and the services
+that have after-fork hooks (``FactoryRegistry.register(after_fork=...)``)
+are passed to their hooks, e.g. to dispose of the connections inherited
+from the parent. This is done for the root containers and for the
+containers of the scopes that have after-fork hooks. The locks of service
+pools, `container_memoize` methods and `ResolutionStats` observers are
+replaced as well.
+
+The containers of inner scopes without after-fork hooks, e.g. request
+containers, are not tracked: they belong to the work that the threads of
+the parent were doing at the time of the fork, and must not be used in the
+child, where their locks may be held forever.
+"""
+import gc
+import logging
+import os
+import weakref
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+_reinit_functions: list[Callable[[], None]] = []
+_objects: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def _track(ob: Any) -> None:
+    """
+    Call ``ob._reinit_after_fork()`` in forked children, and then
+    ``ob._run_after_fork_hooks()`` if it has one.
+    """
+    _objects.add(ob)
+
+
+def _reinit_after_fork(function: Callable[[], None]) -> Callable[[], None]:
+    """
+    Call the function in forked children, before the tracked objects are
+    reinitialized.
+    """
+    _reinit_functions.append(function)
+    return function
+
+
+def _after_fork_in_child() -> None:
+    for function in _reinit_functions:
+        function()
+
+    objects = list(_objects)
+    for ob in objects:
+        ob._reinit_after_fork()
+
+    for ob in objects:
+        run_hooks = getattr(ob, "_run_after_fork_hooks", None)
+        if run_hooks is not None:
+            run_hooks()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def prepare_fork(*, freeze: Iterable[Any] = (), gc_freeze: bool = True) -> None:
+    """
+    Prepare the process for forking workers, after the application has been
+    configured and its services warmed up.
+
+    :param freeze: The `FactoryRegistry` and `FactoryRegistrySet` objects to
+       freeze with their ``freeze`` method
+    :param gc_freeze: Whether to collect garbage and then move all the
+       objects to the permanent generation with `gc.freeze`, so that the
+       collections in the children do not write to, and thereby copy, the
+       memory pages shared with the parent
+    """
+    for registry in freeze:
+        registry.freeze()
+
+    if gc_freeze:
+        gc.collect()
+        gc.freeze()
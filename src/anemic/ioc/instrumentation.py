@@ -0,0 +1,237 @@
+import bisect
+import sys
+import threading
+from typing import IO, NamedTuple
+
+from . import fork
+
+
+class ResolutionObserver:
+    """
+    Receives events about service resolution from the containers it is
+    attached to with `Container.add_observer` or
+    `FactoryRegistrySet.add_observer`. Subclasses override the methods for
+    the events they are interested in; the default implementations do
+    nothing.
+
+    Containers without observers do not pay for the instrumentation beyond
+    a single attribute check per resolution.
+    """
+
+    def cache_hit(self, scope: str, interface: type, name: str) -> None:
+        """
+        A service was found in the cache of the container of `scope`.
+        """
+
+    def cache_miss(self, scope: str, interface: type, name: str) -> None:
+        """
+        A service was not found in the cache of the container of `scope`,
+        and will be constructed.
+        """
+
+    def factory_called(
+        self, scope: str, interface: type, name: str, seconds: float
+    ) -> None:
+        """
+        A factory constructed a service in the container of `scope`. For
+        asynchronous factories the time includes awaiting the factory.
+        """
+
+    def parent_fallthrough(
+        self, scope: str, interface: type, name: str, owner_scope: str
+    ) -> None:
+        """
+        A service requested from the container of `scope` is provided by the
+        parent container of `owner_scope`.
+        """
+
+    def context_resolved(
+        self, scope: str, interface: type, name: str, context_type: type
+    ) -> None:
+        """
+        A service was requested in the container of `scope` for a context of
+        `context_type`.
+        """
+
+
+class _ObserverGroup(ResolutionObserver):
+    def __init__(self, observers: list[ResolutionObserver]):
+        self.observers = observers
+
+    def cache_hit(self, scope, interface, name):
+        for observer in self.observers:
+            observer.cache_hit(scope, interface, name)
+
+    def cache_miss(self, scope, interface, name):
+        for observer in self.observers:
+            observer.cache_miss(scope, interface, name)
+
+    def factory_called(self, scope, interface, name, seconds):
+        for observer in self.observers:
+            observer.factory_called(scope, interface, name, seconds)
+
+    def parent_fallthrough(self, scope, interface, name, owner_scope):
+        for observer in self.observers:
+            observer.parent_fallthrough(scope, interface, name, owner_scope)
+
+    def context_resolved(self, scope, interface, name, context_type):
+        for observer in self.observers:
+            observer.context_resolved(scope, interface, name, context_type)
+
+
+def _combine(observers: list[ResolutionObserver]) -> ResolutionObserver | None:
+    if not observers:
+        return None
+
+    if len(observers) == 1:
+        return observers[0]
+
+    return _ObserverGroup(list(observers))
+
+
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.0001,
+    0.001,
+    0.01,
+    0.1,
+    1.0,
+    10.0,
+)
+"""
+The upper bounds of the latency histogram buckets of `ResolutionStats`, in
+seconds. Latencies above the last bound are counted in an overflow bucket.
+"""
+
+
+class LatencyHistogram(NamedTuple):
+    """
+    A histogram of factory latencies. `counts` has one element per bucket
+    bound, and one more for the latencies that exceed the last bound.
+    """
+
+    bounds: tuple[float, ...]
+    counts: tuple[int, ...]
+    total: float
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class ResolutionStats(ResolutionObserver):
+    """
+    An observer that aggregates resolution events in memory. Events are
+    counted per (event, scope, interface, name), and factory latencies are
+    collected into histograms per (scope, interface, name).
+
+    .. code-block:: python
+
+        stats = ResolutionStats()
+        registry_set.add_observer(stats)
+        ...
+        stats.dump()
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self._counters: dict[tuple[str, str, type, str], int] = {}
+        self._latencies: dict[tuple[str, type, str], tuple[list[int], float]] = {}
+        fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        self.lock = threading.Lock()
+
+    def _count(self, event: str, scope: str, interface: type, name: str) -> None:
+        key = event, scope, interface, name
+        with self.lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def cache_hit(self, scope, interface, name):
+        self._count("hit", scope, interface, name)
+
+    def cache_miss(self, scope, interface, name):
+        self._count("miss", scope, interface, name)
+
+    def parent_fallthrough(self, scope, interface, name, owner_scope):
+        self._count("fallthrough", scope, interface, name)
+
+    def context_resolved(self, scope, interface, name, context_type):
+        self._count("context", scope, interface, name)
+
+    def factory_called(self, scope, interface, name, seconds):
+        key = scope, interface, name
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            counts, total = self._latencies.get(key, (None, 0.0))
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+
+            counts[bucket] += 1
+            self._latencies[key] = counts, total + seconds
+
+    def counters(self) -> dict[tuple[str, str, type, str], int]:
+        """
+        Get a snapshot of the event counters, keyed by (event, scope,
+        interface, name). The events are ``"hit"``, ``"miss"``,
+        ``"fallthrough"`` and ``"context"``.
+        """
+        with self.lock:
+            return dict(self._counters)
+
+    def latencies(self) -> dict[tuple[str, type, str], LatencyHistogram]:
+        """
+        Get a snapshot of the factory latency histograms, keyed by (scope,
+        interface, name).
+        """
+        with self.lock:
+            return {
+                key: LatencyHistogram(self.buckets, tuple(counts), total)
+                for key, (counts, total) in self._latencies.items()
+            }
+
+    def reset(self) -> None:
+        """
+        Discard all collected statistics.
+        """
+        with self.lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+    def dump(self, indent: int = 0, stream: IO[str] | None = None) -> None:
+        """
+        Dump the collected statistics to the given stream. If no stream is
+        given, sys.stderr is used.
+
+        :param indent: The indentation level to use
+        :param stream: The stream to dump to
+        """
+
+        if stream is None:
+            stream = sys.stderr
+
+        per_service: dict[tuple[str, type, str], dict[str, int]] = {}
+        for (event, scope, interface, name), count in self.counters().items():
+            per_service.setdefault((scope, interface, name), {})[event] = count
+
+        latencies = self.latencies()
+        for key in latencies:
+            per_service.setdefault(key, {})
+
+        for (scope, interface, name), events in per_service.items():
+            print(
+                " " * indent + f"{interface.__qualname__} named {name!r} "
+                f"in scope {scope!r}:",
+                file=stream,
+            )
+            for event, count in sorted(events.items()):
+                print(" " * (indent + 4) + f"{event}: {count}", file=stream)
+
+            histogram = latencies.get((scope, interface, name))
+            if histogram is not None:
+                print(
+                    " " * (indent + 4) + f"constructed: {histogram.count}, "
+                    f"total {histogram.total * 1000:.3f} ms",
+                    file=stream,
+                )
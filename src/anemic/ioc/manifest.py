@@ -0,0 +1,170 @@
+"""
+Manifests of the services discovered by `FactoryRegistrySet.scan_services`.
+
+A manifest lists the registrations made by the `service` decorators found in
+a scan, with the interfaces, context types, factories, disposers and
+after-fork hooks as dotted names. Loading a manifest imports only the modules
+that define the interfaces and context types, instead of importing and
+walking every module of the scanned packages; the factories, disposers and
+hooks are imported when first used.
+"""
+import json
+import os
+import sys
+from typing import IO, Any, Iterable, NamedTuple
+
+MANIFEST_VERSION = 1
+
+
+class ManifestEntry(NamedTuple):
+    """
+    A service registration made in a scan.
+    """
+
+    scope: str
+    interface: Any
+    name: str
+    context_type: Any
+    factory: Any
+    disposer: Any
+    after_fork: Any = None
+
+
+def dotted_name(ob: Any) -> str:
+    """
+    Get the dotted name of a module level object in the form
+    ``"package.module:QualifiedName"``. A ValueError is raised if the object
+    cannot be imported by the name. Dotted names and lazily imported
+    factories are returned as is.
+    """
+    if isinstance(ob, str):
+        return ob
+
+    lazy_name = getattr(ob, "dotted_name", None)
+    if isinstance(lazy_name, str):
+        return lazy_name
+
+    module = getattr(ob, "__module__", None)
+    qualname = getattr(ob, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        raise ValueError(f"{ob!r} cannot be referred to by a dotted name")
+
+    name = f"{module}:{qualname}"
+    if _resolve(name) is not ob:
+        raise ValueError(f"{ob!r} is not importable as {name!r}")
+
+    return name
+
+
+def _optional_dotted_name(ob: Any) -> str | None:
+    return None if ob is None else dotted_name(ob)
+
+
+def _module_mtimes(packages: Iterable[str]) -> dict[str, float]:
+    packages = tuple(packages)
+    mtimes = {}
+    for module_name, module in list(sys.modules.items()):
+        if not any(
+            module_name == package or module_name.startswith(package + ".")
+            for package in packages
+        ):
+            continue
+
+        filename = getattr(module, "__file__", None)
+        if filename:
+            mtimes[module_name] = os.stat(filename).st_mtime
+
+    return mtimes
+
+
+def write_manifest(
+    stream: IO[str],
+    entries: Iterable[ManifestEntry],
+    packages: Iterable[str],
+) -> None:
+    """
+    Write the entries to the stream as JSON. The modification times of the
+    modules of the scanned packages are recorded for staleness checks.
+    """
+    registrations = [
+        {
+            "scope": entry.scope,
+            "interface": dotted_name(entry.interface),
+            "name": entry.name,
+            "context_type": _optional_dotted_name(entry.context_type),
+            "factory": dotted_name(entry.factory),
+            "disposer": _optional_dotted_name(entry.disposer),
+            "after_fork": _optional_dotted_name(entry.after_fork),
+        }
+        for entry in entries
+    ]
+    json.dump(
+        {
+            "version": MANIFEST_VERSION,
+            "modules": _module_mtimes(packages),
+            "registrations": registrations,
+        },
+        stream,
+        indent=1,
+    )
+
+
+def read_manifest(
+    stream: IO[str], *, check_mtimes: bool = False
+) -> list[dict[str, Any]]:
+    """
+    Read the registrations from a manifest written by `write_manifest`. The
+    dotted names are not resolved.
+
+    :param check_mtimes: If true, a RuntimeError is raised if any module
+       recorded in the manifest has been modified or removed since the
+       manifest was written
+    """
+    manifest = json.load(stream)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise RuntimeError(f"Unsupported manifest version {manifest.get('version')!r}")
+
+    if check_mtimes:
+        from importlib.util import find_spec
+
+        for module_name, mtime in manifest["modules"].items():
+            spec = find_spec(module_name)
+            if spec is None or spec.origin is None:
+                raise RuntimeError(f"Manifest is stale: {module_name} is missing")
+
+            try:
+                current = os.stat(spec.origin).st_mtime
+            except OSError:
+                current = None
+
+            if current != mtime:
+                raise RuntimeError(f"Manifest is stale: {module_name} has changed")
+
+    return manifest["registrations"]
+
+
+def _resolve(name: str) -> Any:
+    from pkgutil import resolve_name
+
+    return resolve_name(name)
+
+
+def _resolve_optional(name: str | None) -> Any:
+    return None if name is None else _resolve(name)
+
+
+def resolve_registration(registration: dict[str, Any]) -> dict[str, Any]:
+    """
+    Resolve the dotted names of a registration read from a manifest into the
+    keyword arguments of `FactoryRegistry.register`. The factory, the
+    disposer and the after-fork hook are left as dotted names, to be
+    imported on first use.
+    """
+    return dict(
+        interface=_resolve(registration["interface"]),
+        name=registration["name"],
+        context_type=_resolve_optional(registration["context_type"]),
+        factory=registration["factory"],
+        disposer=registration["disposer"],
+        after_fork=registration.get("after_fork"),
+    )
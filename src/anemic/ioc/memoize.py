@@ -0,0 +1,184 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, TypeVar
+
+from . import fork
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class MemoStats(NamedTuple):
+    """
+    The statistics of a method decorated with `container_memoize`, over all
+    the containers it has cached results in.
+    """
+
+    hits: int
+    misses: int
+    #: results dropped because of ``maxsize``
+    evictions: int
+    #: results dropped because of ``ttl``
+    expirations: int
+
+
+class _MemoCache(OrderedDict):
+    """
+    The results of a memoized method in one container, least recently used
+    first. Expired results are swept at most once per ``ttl`` on a miss.
+    """
+
+    next_sweep = 0.0
+
+
+class _Memo:
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        scope: str | None,
+        maxsize: int | None,
+        ttl: float | None,
+    ):
+        self.function = function
+        self.scope = scope
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        self.lock = threading.Lock()
+
+    def _cache_for(self, service: Any) -> tuple[_MemoCache, bool]:
+        """
+        Get the cache of the container of the scope, and whether it is the
+        service's own container.
+        """
+        container = service.container
+        if self.scope is not None:
+            for container in container._chain:
+                if container.scope == self.scope:
+                    break
+            else:
+                raise LookupError(
+                    f"No container of scope {self.scope!r} is available to "
+                    f"{self.function.__qualname__}; the scope must be that of "
+                    f"the container of the service or of one of its parents"
+                )
+
+        caches = container._memo_caches
+        if caches is None:
+            caches = vars(container).setdefault("_memo_caches", {})
+
+        cache = caches.get(self)
+        if cache is None:
+            cache = caches.setdefault(self, _MemoCache())
+
+        return cache, container is service.container
+
+    def call(self, service: Any, args: tuple, kwargs: dict[str, Any]) -> Any:
+        cache, own_container = self._cache_for(service)
+        key: tuple = (args, tuple(sorted(kwargs.items()))) if kwargs else (args,)
+        # a container of an outer scope outlives the service; results cached
+        # there are shared by the services of all the inner containers, and
+        # must not keep them alive
+        if own_container:
+            key = (service,) + key
+
+        with self.lock:
+            entry = cache.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires >= time.monotonic():
+                    self.hits += 1
+                    cache.move_to_end(key)
+                    return value
+
+                del cache[key]
+                self.expirations += 1
+
+            self.misses += 1
+
+        value = self.function(service, *args, **kwargs)
+        now = time.monotonic()
+        expires = float("inf") if self.ttl is None else now + self.ttl
+        with self.lock:
+            if self.ttl is not None and now >= cache.next_sweep:
+                self._sweep(cache, now)
+
+            cache[key] = value, expires
+            cache.move_to_end(key)
+            if self.maxsize is not None:
+                while len(cache) > self.maxsize:
+                    cache.popitem(last=False)
+                    self.evictions += 1
+
+        return value
+
+    def _sweep(self, cache: _MemoCache, now: float) -> None:
+        expired = [key for key, (_, expires) in cache.items() if expires < now]
+        for key in expired:
+            del cache[key]
+
+        self.expirations += len(expired)
+        cache.next_sweep = now + self.ttl
+
+    def stats(self) -> MemoStats:
+        with self.lock:
+            return MemoStats(self.hits, self.misses, self.evictions, self.expirations)
+
+
+def container_memoize(
+    scope: str | None = None,
+    *,
+    maxsize: int | None = None,
+    ttl: float | None = None,
+) -> Callable[[F], F]:
+    """
+    A decorator that caches the results of a service method in a container,
+    by the service and the arguments of the call. The service must have a
+    ``container`` attribute; the results are cached in the container of the
+    given scope in its chain, or in the service's own container if no scope
+    is given, and are dropped when that container is closed or garbage
+    collected. Results cached in the service's own container are keyed by
+    the service and the arguments; results cached in a parent container are
+    keyed by the arguments only, and are shared by the services of all its
+    child containers, e.g. ``scope="application"`` on a request scoped
+    service caches results across requests.
+
+    .. code-block:: python
+
+        class Permissions:
+            def __init__(self, container):
+                self.container = container
+
+            @container_memoize(scope="request")
+            def allowed(self, user_id: int, permission: str) -> bool:
+                ...
+
+    The arguments must be hashable. Exceptions are not cached, and
+    concurrent first calls with the same arguments may each call the
+    method. The statistics of the method are available from its ``stats()``
+    function as `MemoStats`.
+
+    :param scope: The scope of the container to cache the results in
+    :param maxsize: The maximum number of results to cache per container;
+       the least recently used results are dropped first
+    :param ttl: The number of seconds a result is cached for; expired
+       results are dropped when they are looked up, and swept from the
+       container at most once per `ttl` when a result is cached
+    """
+
+    def decorator(function: F) -> F:
+        memo = _Memo(function, scope, maxsize, ttl)
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            return memo.call(self, args, kwargs)
+
+        wrapper.stats = memo.stats  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
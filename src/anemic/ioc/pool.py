@@ -0,0 +1,229 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from . import fork
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats(NamedTuple):
+    """
+    A snapshot of the statistics of a `ServicePool`.
+    """
+
+    max_size: int
+    #: pooled instances currently alive, idle or checked out
+    size: int
+    idle: int
+    #: instances created, including overflow instances
+    created: int
+    checkouts: int
+    #: checkouts that had to wait for an instance to be returned
+    waits: int
+    #: checkouts that were served with an overflow instance
+    overflows: int
+    #: instances disposed of instead of being returned to the pool
+    discarded: int
+
+
+class ServicePool:
+    """
+    A pool of instances of a service that is too expensive to construct
+    for every request but cannot be shared between threads. The pool is
+    registered in the registry of a scope with
+    `FactoryRegistry.register_pooled`: the containers of the scope check an
+    instance out when the service is first requested, and return it when
+    they are closed.
+
+    When all the ``max_size`` instances are checked out, a checkout waits
+    for one to be returned, for at most ``timeout`` seconds. With
+    ``overflow=True`` it constructs a temporary instance instead, which is
+    disposed of when it is returned.
+
+    The factory is called with the container that first checks the instance
+    out. Instances outlive that container, so they must not keep services
+    of its scope.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Any], Any],
+        *,
+        max_size: int,
+        overflow: bool = False,
+        timeout: float | None = None,
+        reset: Callable[[Any], Any] | None = None,
+        dispose: Callable[[Any], Any] | None = None,
+    ):
+        """
+        :param factory: The factory of the pooled service
+        :param max_size: The maximum number of pooled instances
+        :param overflow: Whether to construct temporary instances instead of
+           waiting when the pool is exhausted
+        :param timeout: The number of seconds to wait for an instance
+           before raising TimeoutError, or None to wait indefinitely
+        :param reset: A callable that is called with an instance when it is
+           returned to the pool. If it raises, the instance is disposed of.
+        :param dispose: A callable that is called with an instance when it
+           is disposed of
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.reset = reset
+        self.dispose = dispose
+
+        self._condition = threading.Condition(threading.Lock())
+        self._idle: list[Any] = []
+        self._overflowing: set[int] = set()
+        self._size = 0
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._overflows = 0
+        self._discarded = 0
+        fork._track(self)
+
+    def _reinit_after_fork(self) -> None:
+        # the idle instances belong to the parent process, and the checked
+        # out instances of its other threads are never returned
+        self._condition = threading.Condition(threading.Lock())
+        self._idle = []
+        self._overflowing = set()
+        self._size = 0
+
+    def checkout(self, container: Any) -> Any:
+        """
+        Take an idle instance from the pool, or construct one.
+        """
+        with self._condition:
+            self._checkouts += 1
+            deadline = None
+            waited = False
+            while not self._idle:
+                if self._size < self.max_size:
+                    self._size += 1
+                    overflow = False
+                    break
+
+                if self.overflow:
+                    self._overflows += 1
+                    overflow = True
+                    break
+
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                    if self.timeout is not None:
+                        deadline = time.monotonic() + self.timeout
+
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No pooled instance of {self.factory!r} was "
+                            f"returned in {self.timeout} seconds"
+                        )
+
+                self._condition.wait(remaining)
+
+            else:
+                return self._idle.pop()
+
+        try:
+            service = self.factory(container)
+        except BaseException:
+            with self._condition:
+                if not overflow:
+                    self._size -= 1
+                    self._condition.notify()
+
+            raise
+
+        with self._condition:
+            self._created += 1
+            if overflow:
+                self._overflowing.add(id(service))
+
+        return service
+
+    def checkin(self, service: Any) -> None:
+        """
+        Return an instance to the pool, resetting it with the reset hook.
+        Overflow instances and instances that fail to reset are disposed of.
+        """
+        with self._condition:
+            if id(service) in self._overflowing:
+                self._overflowing.discard(id(service))
+                self._discarded += 1
+                discard = True
+            else:
+                discard = False
+
+        if not discard and self.reset is not None:
+            try:
+                self.reset(service)
+            except Exception:
+                logger.exception("Error resetting pooled %r", service)
+                discard = True
+                with self._condition:
+                    self._size -= 1
+                    self._discarded += 1
+                    self._condition.notify()
+
+        if discard:
+            self._dispose(service)
+            return
+
+        with self._condition:
+            self._idle.append(service)
+            self._condition.notify()
+
+    def clear(self) -> None:
+        """
+        Dispose of the idle instances. Checked out instances are returned to
+        the pool as usual.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._discarded += len(idle)
+            self._condition.notify(len(idle))
+
+        for service in idle:
+            self._dispose(service)
+
+    def stats(self) -> PoolStats:
+        """
+        Get a snapshot of the statistics of the pool.
+        """
+        with self._condition:
+            return PoolStats(
+                max_size=self.max_size,
+                size=self._size,
+                idle=len(self._idle),
+                created=self._created,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                overflows=self._overflows,
+                discarded=self._discarded,
+            )
+
+    def _dispose(self, service: Any) -> None:
+        if self.dispose is None:
+            return
+
+        try:
+            self.dispose(service)
+        except Exception:
+            logger.exception("Error disposing pooled %r", service)
+
+    def __repr__(self):
+        return f"<ServicePool of {self.factory!r}, max_size={self.max_size}>"
@@ -0,0 +1,136 @@
+"""
+Services that run in a pool of worker processes.
+
+A service registered with `FactoryRegistry.register_in_processes` is
+resolved as a `ProcessProxy`. The method calls of the proxy are executed
+by the service in a worker process; each worker builds its own containers
+from the registry set returned by the ``bootstrap`` callable, in which the
+same registration provides the actual service.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pkgutil import resolve_name
+from typing import Any, Callable, Sequence
+
+_worker_container: Any = None
+_in_worker = False
+
+
+def in_worker() -> bool:
+    """
+    Whether the current process is a worker process of a `ProcessProxy`
+    that is being bootstrapped or has been bootstrapped.
+    """
+    return _in_worker
+
+
+def _bootstrap_worker(bootstrap: str, scopes: Sequence[str]) -> None:
+    global _worker_container, _in_worker
+    from .container import Container
+
+    _in_worker = True
+    registry_set = resolve_name(bootstrap)()
+    container = None
+    for scope in scopes:
+        container = Container(registry_set.get_registry(scope), container)
+
+    _worker_container = container
+
+
+def _call_in_worker(
+    interface: type, name: str, method: str, args: tuple, kwargs: dict[str, Any]
+) -> Any:
+    service = _worker_container.get(interface=interface, name=name)
+    return getattr(service, method)(*args, **kwargs)
+
+
+class ProcessProxy:
+    """
+    A proxy of a service that runs in worker processes. Calling a method of
+    the proxy runs the method of the service in a worker and returns its
+    result; the arguments and the result must be picklable. `submit` and
+    `acall` return a future and an awaitable instead.
+
+    The workers are started on the first call.
+    """
+
+    def __init__(
+        self,
+        interface: type,
+        name: str,
+        *,
+        bootstrap: str,
+        scopes: Sequence[str],
+        max_workers: int | None = None,
+        mp_context: Any = None,
+    ):
+        self.interface = interface
+        self.name = name
+        self.bootstrap = bootstrap
+        self.scopes = tuple(scopes)
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=self.mp_context,
+                        initializer=_bootstrap_worker,
+                        initargs=(self.bootstrap, self.scopes),
+                    )
+
+                executor = self._executor
+
+        return executor
+
+    def submit(self, method: str, /, *args: Any, **kwargs: Any) -> "Future[Any]":
+        """
+        Call the method of the service in a worker process.
+
+        :return: A future of the result of the call
+        """
+        return self._get_executor().submit(
+            _call_in_worker, self.interface, self.name, method, args, kwargs
+        )
+
+    async def acall(self, method: str, /, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call the method of the service in a worker process, and await the
+        result.
+        """
+        return await asyncio.wrap_future(self.submit(method, *args, **kwargs))
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self.submit(method, *args, **kwargs).result()
+
+        call.__name__ = method
+        return call
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker processes. They are started again on the next call.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _after_fork(self) -> None:
+        # the workers of the parent cannot be used from a forked child
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __repr__(self):
+        return f"<ProcessProxy of {self.interface.__qualname__} named {self.name!r}>"
@@ -1,10 +1,11 @@
 import sys
 from itertools import count
 
-from pyramid.path import caller_module
 
+def caller_package(ignored_modules=(), caller_module=None):
+    if caller_module is None:
+        from pyramid.path import caller_module
 
-def caller_package(ignored_modules=(), caller_module=caller_module):
     ignored_modules = set(ignored_modules)
     ignored_modules.add(__name__)
     for i in count(3):
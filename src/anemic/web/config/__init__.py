@@ -1,17 +1,47 @@
-from typing import Callable, Any, Iterable
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Any, Iterable
 
 import sys
 
 from collections import ChainMap
 from collections.abc import Mapping
 from functools import wraps
-from pyramid.config import *
 
-from pyramid.config import Configurator
 from anemic.decorators import deprecated
-from anemic.i18n import configure_i18n
 from anemic.util.collections import flatten
 from anemic.util.path import caller_package
+from anemic.web.config.profiler import (
+    StartupProfiler,
+    get_profiler,
+    profiling_configurator,
+)
+
+if TYPE_CHECKING:
+    from pyramid.config import Configurator
+
+
+def __getattr__(name: str):
+    # pyramid.config is imported on first use instead of being star-imported,
+    # but its names remain available from this module, also to
+    # ``from anemic.web.config import *``
+    import pyramid.config
+
+    if name == "__all__":
+        value = sorted(
+            {n for n in vars(pyramid.config) if not n.startswith("_")}
+            | {n for n in globals() if not n.startswith("_")}
+        )
+    else:
+        try:
+            value = getattr(pyramid.config, name)
+        except AttributeError:
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+
+    globals()[name] = value
+    return value
 
 
 class AnemicAppFactory(object):
@@ -31,7 +61,7 @@ class AnemicAppFactory(object):
 
     # :type config: Configurator
     config = None
-    default_includes = ["anemic.services", "anemic.renderers.json"]
+    default_includes = ["anemic.web.services", "anemic.web.renderers.json"]
 
     @deprecated
     def __new__(cls, global_config, **settings_kw):
@@ -68,9 +98,13 @@ class AnemicAppFactory(object):
 
     def prepare_i18n(self):
         if self.i18n:
+            from anemic.web.i18n import configure_i18n
+
             configure_i18n(self.config, self.default_i18n_domain)
 
     def make_configurator(self) -> Configurator:
+        from pyramid.config import Configurator
+
         return Configurator(settings=self.settings)
 
     pre_configure_app = _dummy
@@ -140,12 +174,30 @@ def create_configurator(
     global_config=None,
     settings: Mapping[str, Any] | None = None,
     merge_global_config=True,
-    configurator_class=Configurator,
+    configurator_class: type[Configurator] | None = None,
     included_features: Iterable[str] = (),
     excluded_features: Iterable[str] = (),
     package=None,
+    profile_startup: str | None = None,
     **kw,
 ) -> Configurator:
+    """
+    Create a configurator and include the features.
+
+    If `profile_startup` is ``"table"`` or ``"json"``, the time and the
+    number of imported modules of the feature includes, the scans, the
+    commits and `make_wsgi_app` are recorded, and reported to stderr in
+    that format when the WSGI application has been made. The profiler is
+    available as ``config.registry.anemic_startup_profiler``.
+    """
+    if configurator_class is None:
+        from pyramid.config import Configurator as configurator_class
+
+    profiler = None
+    if profile_startup:
+        profiler = StartupProfiler(profile_startup)
+        configurator_class = profiling_configurator(configurator_class)
+
     defaults: dict[str, Any] = {}
 
     if not settings:
@@ -172,7 +224,14 @@ def create_configurator(
 
     defaults["default_i18n_domain"] = package_name
 
-    config = configurator_class(settings=settings, package=package, **kw)
+    if profiler is not None:
+        with profiler.step("create configurator"):
+            config = configurator_class(settings=settings, package=package, **kw)
+
+        config.registry.anemic_startup_profiler = profiler
+    else:
+        config = configurator_class(settings=settings, package=package, **kw)
+
     config.add_settings(extracted_settings)
     included_features = list(flatten(included_features))
     excluded_features = set(flatten(excluded_features))
@@ -183,7 +242,11 @@ def create_configurator(
     for feature_name in included_features:
         if feature_name in feature_set:
             try:
-                config.include("anemic." + feature_name)
+                if profiler is not None:
+                    with profiler.step("include anemic.web." + feature_name):
+                        config.include("anemic.web." + feature_name)
+                else:
+                    config.include("anemic.web." + feature_name)
             except Exception as e:
                 print(
                     "Unable to include feature {}: {}".format(feature_name, e),
@@ -200,6 +263,7 @@ def application_factory(
     included_features=MINIMAL_FEATURES,
     excluded_features=(),
     package=None,
+    profile_startup: str | None = None,
     **extra_parameters,
 ):
     """
@@ -223,6 +287,9 @@ def application_factory(
     `package` should be the package passed to the Configurator object;
     otherwise the package of the caller is assumed.
 
+    `profile_startup` enables the startup profiler of `create_configurator`
+    (``"table"`` or ``"json"``); the wrapped function is profiled too.
+
     :param factory_function: The actual wrapped factory function that
     accepts parameter (config: Configurator)
     :param configure_only: True if no WSGI application is to be made, false
@@ -259,16 +326,28 @@ def application_factory(
                 included_features=included_features,
                 excluded_features=excluded_features,
                 package=package,
+                profile_startup=profile_startup,
                 **extra_parameters,
             )
 
-            returned = function(config)
+            profiler = get_profiler(config)
+            if profiler is not None:
+                with profiler.step("factory " + function.__qualname__):
+                    returned = function(config)
+            else:
+                returned = function(config)
+
+            from pyramid.config import Configurator
+
             if isinstance(returned, Configurator):
                 config = returned
 
             if not configure_only:
                 return config.make_wsgi_app()
             else:
+                if profiler is not None:
+                    profiler.report()
+
                 return returned
 
         return wrapper
@@ -0,0 +1,133 @@
+"""
+Deferred features: features whose heavy configuration, such as the include
+of a template engine, is applied only when one of their renderers is first
+used.
+
+Until then, the directives of a deferred feature only record their calls,
+and its renderers are placeholders. On the first use of a renderer the
+feature's module is included and the recorded directive calls are
+replayed, each with a new configurator of the application registry, and
+committed.
+"""
+import threading
+from typing import Any, Iterable
+
+from pyramid.config import Configurator
+from pyramid.exceptions import ConfigurationError
+from pyramid.interfaces import IRendererFactory
+from pyramid.settings import asbool
+
+
+class DeferredFeature(object):
+    def __init__(self, name: str, include: str):
+        self.name = name
+        self.include = include
+        self.calls: list[tuple[Any, str, tuple, dict[str, Any]]] = []
+        self.active = False
+        self._lock = threading.RLock()
+
+    def record(self, config: Configurator, directive: str, args, kw) -> None:
+        self.calls.append((config.package, directive, args, kw))
+
+    def add_renderer(self, config: Configurator, name: str) -> None:
+        """
+        Add a placeholder renderer that activates the feature on first use.
+        The feature must register the actual renderer by the same name.
+        """
+        config.add_renderer(name, _DeferredRendererFactory(self, name))
+
+    def activate(self, registry) -> None:
+        """
+        Include the feature and replay the recorded directive calls, once.
+        """
+        if self.active:
+            return
+
+        with self._lock:
+            if self.active:
+                return
+
+            config = Configurator(registry=registry, package=self.include)
+            config.include(self.include)
+            config.commit()
+            for package, directive, args, kw in self.calls:
+                config = Configurator(registry=registry, package=package)
+                getattr(config, directive)(*args, **kw)
+                config.commit()
+
+            self.active = True
+
+
+class _DeferredRendererFactory(object):
+    def __init__(self, feature: DeferredFeature, name: str):
+        self.feature = feature
+        self.name = name
+
+    def __call__(self, info):
+        registry = info.registry
+        self.feature.activate(registry)
+        factory = registry.queryUtility(IRendererFactory, name=self.name)
+        if factory is None or factory is self:
+            raise ConfigurationError(
+                "Feature {} did not register the renderer {!r}".format(
+                    self.feature.name, self.name
+                )
+            )
+
+        return factory(info)
+
+
+def _make_recorder(feature: DeferredFeature, directive: str):
+    def record(config: Configurator, *args, **kw) -> None:
+        feature.record(config, directive, args, kw)
+
+    record.__name__ = directive
+    return record
+
+
+def defer_features(config: Configurator) -> bool:
+    """
+    Whether features should be deferred; false unless the
+    ``anemic.defer_features`` setting is true. Deferring moves the errors
+    in the setup of a feature from the startup of the application to the
+    first use of the feature.
+    """
+    return asbool(config.get_settings().get("anemic.defer_features", False))
+
+
+def add_deferred_feature(
+    config: Configurator,
+    name: str,
+    *,
+    include: str,
+    directives: Iterable[str] = (),
+    renderers: Iterable[str] = (),
+) -> DeferredFeature:
+    """
+    Register a deferred feature. If it is already registered, the existing
+    feature is returned.
+
+    :param name: The name of the feature
+    :param include: The dotted name of the module or function to include
+       when the feature is activated
+    :param directives: The names of the directives that the include adds;
+       their calls are recorded until the feature is activated
+    :param renderers: The names of the renderers that the include adds;
+       the first use of any of them activates the feature
+    """
+    registry = config.registry
+    features = getattr(registry, "anemic_deferred_features", None)
+    if features is None:
+        features = registry.anemic_deferred_features = {}
+
+    if name in features:
+        return features[name]
+
+    feature = features[name] = DeferredFeature(name, include)
+    for directive in directives:
+        config.add_directive(directive, _make_recorder(feature, directive))
+
+    for renderer in renderers:
+        feature.add_renderer(config, renderer)
+
+    return feature
@@ -0,0 +1,143 @@
+"""
+Startup profiling for `create_configurator` and `application_factory`.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import IO, TYPE_CHECKING, ContextManager, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    from pyramid.config import Configurator
+
+REPORT_FORMATS = ("table", "json")
+
+
+class StartupStep(NamedTuple):
+    """
+    A profiled step of the application startup. Steps may be nested, e.g.
+    ``config.commit`` within ``make_wsgi_app``, in which case the time and
+    the imports of the inner step are included in the outer step.
+    """
+
+    label: str
+    seconds: float
+    #: the number of modules imported during the step
+    imports: int
+
+
+class StartupProfiler(object):
+    """
+    Records the wall time and the number of imported modules of the steps
+    of the application startup, and reports them sorted by time.
+    """
+
+    def __init__(self, report_format: str = "table", stream: IO[str] | None = None):
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(
+                "Invalid report format {!r}, must be one of {}".format(
+                    report_format, ", ".join(REPORT_FORMATS)
+                )
+            )
+
+        self.report_format = report_format
+        self.stream = stream
+        self.steps: list[StartupStep] = []
+        self.reported = False
+
+    @contextmanager
+    def step(self, label: str) -> Iterator[None]:
+        modules = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append(
+                StartupStep(
+                    label,
+                    time.perf_counter() - start,
+                    len(sys.modules) - modules,
+                )
+            )
+
+    def report(self, stream: IO[str] | None = None) -> None:
+        """
+        Write the steps to the stream, slowest first, in the report format.
+        If no stream is given, the stream of the profiler or sys.stderr is
+        used.
+        """
+        self.reported = True
+        stream = stream or self.stream or sys.stderr
+        steps = sorted(self.steps, key=lambda step: step.seconds, reverse=True)
+        if self.report_format == "json":
+            json.dump([step._asdict() for step in steps], stream, indent=1)
+            print(file=stream)
+            return
+
+        width = max([len("step")] + [len(step.label) for step in steps])
+        print(f"{'step':<{width}} {'ms':>10} {'imports':>8}", file=stream)
+        for step in steps:
+            print(
+                f"{step.label:<{width}} {step.seconds * 1000:>10.1f} "
+                f"{step.imports:>8}",
+                file=stream,
+            )
+
+
+def get_profiler(config: Configurator) -> StartupProfiler | None:
+    """
+    Get the startup profiler of the application being configured, if
+    profiling is enabled.
+    """
+    return getattr(config.registry, "anemic_startup_profiler", None)
+
+
+def _step(config: Configurator, label: str) -> ContextManager[None]:
+    # the configurator commits while it is being constructed, before the
+    # profiler is attached to the registry
+    profiler = get_profiler(config)
+    if profiler is None:
+        return nullcontext()
+
+    return profiler.step(label)
+
+
+def _package_name(package) -> str:
+    if package is None:
+        return "<caller package>"
+
+    return getattr(package, "__name__", str(package))
+
+
+def profiling_configurator(configurator_class: type) -> type:
+    """
+    Make a subclass of the configurator class that records its scans,
+    commits and the creation of the WSGI application in the startup
+    profiler of its registry. The report is written when the WSGI
+    application has been created.
+    """
+
+    class ProfilingConfigurator(configurator_class):
+        def scan(self, package=None, *args, **kw):
+            with _step(self, "scan " + _package_name(package)):
+                return super().scan(package, *args, **kw)
+
+        def commit(self):
+            with _step(self, "config.commit"):
+                return super().commit()
+
+        def make_wsgi_app(self):
+            with _step(self, "make_wsgi_app"):
+                app = super().make_wsgi_app()
+
+            profiler = get_profiler(self)
+            if profiler is not None:
+                profiler.report()
+
+            return app
+
+    ProfilingConfigurator.__name__ = "Profiling" + configurator_class.__name__
+    ProfilingConfigurator.__qualname__ = ProfilingConfigurator.__name__
+    return ProfilingConfigurator
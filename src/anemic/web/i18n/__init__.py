@@ -19,7 +19,9 @@ def add_renderer_globals(event):
 
 def configure_i18n(config: Configurator, default_domain: str):
     config.add_subscriber(add_renderer_globals, "pyramid.events.BeforeRender")
-    config.add_subscriber(add_renderer_globals, "anemic.viewlet.IBeforeViewletRender")
+    config.add_subscriber(
+        add_renderer_globals, "anemic.web.viewlet.IBeforeViewletRender"
+    )
 
     config.registry.tsf = tsf = TranslationStringFactory(default_domain)
 
@@ -0,0 +1,101 @@
+"""
+Pyramid integration of `anemic.ioc`.
+
+Including this module attaches an application scoped `Container` to the
+Pyramid registry as ``registry.container``, and a request scoped child
+container to every request as ``request.container``. The request container
+is created on first access and closed in a finished callback.
+
+Services registered with the ``service`` decorator of `anemic.web.services`
+after the inclusion are registered in the containers: ``scope="global"``
+services in the ``application`` scope and ``scope="request"`` services in
+the ``request`` scope. `anemic.web.services.autowired` and
+``request.find_service`` then resolve them from the containers.
+
+.. code-block:: python
+
+    config.include("anemic.web.services")
+    config.include("anemic.web.ioc")
+    config.scan_services()
+"""
+from typing import Any, Callable
+
+from pyramid.config import Configurator
+
+from anemic.ioc import Container, FactoryRegistry, FactoryRegistrySet
+
+APPLICATION_SCOPE = "application"
+REQUEST_SCOPE = "request"
+
+
+class RequestContainer(Container):
+    """
+    The container of a request. Request scoped services are constructed
+    with `request`.
+    """
+
+    def __init__(
+        self,
+        factory_registry: FactoryRegistry,
+        parent: Container,
+        request: Any,
+    ):
+        super().__init__(factory_registry, parent)
+        self.request = request
+
+
+def get_registry_set(registry: Any) -> FactoryRegistrySet | None:
+    """
+    Get the registry set of the containers of a Pyramid registry, or None if
+    this module has not been included.
+    """
+    return getattr(registry, "ioc_registries", None)
+
+
+def register_global_service(
+    registry: Any, factory: Callable[[Any], Any], *, interface: Any, name: str
+) -> None:
+    """
+    Register a ``scope="global"`` service factory, which is called with the
+    container of the application.
+    """
+    get_registry_set(registry).get_registry(APPLICATION_SCOPE).register(
+        interface=interface, name=name, factory=factory
+    )
+
+
+def register_request_service(
+    registry: Any, service_factory: Callable[..., Any], *, interface: Any, name: str
+) -> None:
+    """
+    Register a ``scope="request"`` service, which is constructed with
+    ``service_factory(request=request)`` once per request.
+    """
+
+    def factory(container: RequestContainer) -> Any:
+        return service_factory(request=container.request)
+
+    get_registry_set(registry).get_registry(REQUEST_SCOPE).register(
+        interface=interface, name=name, factory=factory
+    )
+
+
+def _request_container(request) -> RequestContainer:
+    registry = request.registry
+    container = RequestContainer(
+        get_registry_set(registry).get_registry(REQUEST_SCOPE),
+        registry.container,
+        request,
+    )
+    request.add_finished_callback(lambda request: container.close())
+    return container
+
+
+def includeme(config: Configurator) -> None:
+    registry_set = FactoryRegistrySet()
+    application_registry = registry_set.create_registry(APPLICATION_SCOPE)
+    registry_set.create_registry(REQUEST_SCOPE)
+
+    config.registry.ioc_registries = registry_set
+    config.registry.container = Container(application_registry)
+    config.add_request_method(_request_container, "container", reify=True)
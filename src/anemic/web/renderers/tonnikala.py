@@ -1,11 +1,50 @@
 from pyramid.config import Configurator
+from pyramid.settings import aslist
+from pyramid.util import is_nonstr_iter
+
+from anemic.web.config.deferred import add_deferred_feature, defer_features
+
+#: the directives of tonnikala.pyramid other than add_tonnikala_extensions
+TONNIKALA_DIRECTIVES = (
+    "add_tonnikala_search_paths",
+    "set_tonnikala_reload",
+    "set_tonnikala_l10n",
+)
 
 
 def i18n(config: Configurator):
-    config.include("anemic.renderers.tonnikala")
+    config.include("anemic.web.renderers.tonnikala")
     config.set_tonnikala_l10n(True)
 
 
 def includeme(config: Configurator):
-    config.include("tonnikala.pyramid")
+    if not defer_features(config):
+        config.include("tonnikala.pyramid")
+        config.add_tonnikala_extensions(".tk")
+        return
+
+    # the template engine is imported when a template is first rendered
+    feature = add_deferred_feature(
+        config,
+        "renderers.tonnikala",
+        include="tonnikala.pyramid",
+        directives=TONNIKALA_DIRECTIVES,
+    )
+
+    def add_tonnikala_extensions(config: Configurator, *extensions) -> None:
+        feature.record(config, "add_tonnikala_extensions", extensions, {})
+        for extension in extensions:
+            feature.add_renderer(config, extension)
+
+    config.add_directive("add_tonnikala_extensions", add_tonnikala_extensions)
     config.add_tonnikala_extensions(".tk")
+
+    # tonnikala.pyramid adds the extensions of the setting when it is
+    # included; their renderers must activate the feature too
+    extensions = (config.get_settings() or {}).get("tonnikala.extensions")
+    if extensions:
+        if not is_nonstr_iter(extensions):
+            extensions = aslist(extensions, flatten=True)
+
+        for extension in extensions:
+            feature.add_renderer(config, extension)
@@ -1,9 +1,15 @@
 import re
-from typing import Type, TypeVar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Type, TypeVar
 
 import venusian
 from pyramid.config import Configurator
+from pyramid.settings import asbool
 from anemic.decorators import reify_attr
+from anemic.ioc import WarmUpTiming
+from anemic.web import ioc
 from zope.interface import Interface
 from zope.interface.interface import InterfaceClass
 
@@ -17,17 +23,136 @@ def _underscore(name):
 _is_iface_name = re.compile("^I[A-Z].*")
 
 
+def _attribute_name(interface):
+    name = interface.__name__
+    if _is_iface_name.match(name):
+        name = name[1:]
+
+    return _underscore(name)
+
+
 class ServiceRegistry(object):
     def __init__(self):
         self.__services__ = []
+        self._lazy_services = {}
+        self._lazy_by_attribute = {}
 
     def _register_service(self, instance, interface):
         self.__services__.append((instance, interface))
-        name = interface.__name__
-        if _is_iface_name.match(name):
-            name = name[1:]
+        setattr(self, _attribute_name(interface), instance)
+
+    def _register_lazy_service(self, lazy_service: "_LazyService"):
+        self._lazy_services[lazy_service.interface, lazy_service.name] = lazy_service
+        self._lazy_by_attribute[_attribute_name(lazy_service.interface)] = lazy_service
+
+    def __getattr__(self, name):
+        # lazy global services that have not been built yet
+        lazy_service = self.__dict__.get("_lazy_by_attribute", {}).get(name)
+        if lazy_service is None:
+            raise AttributeError(name)
+
+        return lazy_service.get()
+
+
+_unbuilt = object()
+
+
+class _LazyService(object):
+    """
+    A global service that is built on first lookup, once, even when looked
+    up from several threads at the same time.
+    """
+
+    def __init__(self, registry, service_factory, interface, name, eager):
+        self.registry = registry
+        self.service_factory = service_factory
+        self.interface = interface
+        self.name = name
+        self.eager = eager
+        self.instance: Any = _unbuilt
+        self._lock = threading.RLock()
+        self._builder = None
+
+    def get(self):
+        instance = self.instance
+        if instance is not _unbuilt:
+            return instance
+
+        with self._lock:
+            if self.instance is not _unbuilt:
+                return self.instance
+
+            if self._builder == threading.get_ident():
+                raise RuntimeError(
+                    "Circular dependency while building {}".format(self.interface)
+                )
+
+            self._builder = threading.get_ident()
+            try:
+                instance = self.service_factory(registry=self.registry)
+            finally:
+                self._builder = None
+
+            get_service_registry(self.registry)._register_service(
+                instance, self.interface
+            )
+            if isinstance(self.interface, InterfaceClass):
+                self.registry.registerUtility(instance, self.interface, name=self.name)
+
+            self.instance = instance
+
+        _restore_lookups_when_built(self.registry)
+        return instance
+
 
-        setattr(self, _underscore(name), instance)
+def _install_lazy_lookups(registry):
+    """
+    Make ``registry.queryUtility`` and ``registry.getUtility`` build the lazy
+    global services that have not been built yet. The original lookups are
+    restored when all of them have been built.
+    """
+    if getattr(registry, "_anemic_lazy_lookups", False):
+        return
+
+    lazy_services = get_service_registry(registry)._lazy_services
+    query_utility = registry.queryUtility
+    get_utility = registry.getUtility
+
+    def queryUtility(provided, name="", default=None):
+        lazy_service = lazy_services.get((provided, name))
+        if lazy_service is not None:
+            return lazy_service.get()
+
+        return query_utility(provided, name, default)
+
+    def getUtility(provided, name=""):
+        lazy_service = lazy_services.get((provided, name))
+        if lazy_service is not None:
+            return lazy_service.get()
+
+        return get_utility(provided, name)
+
+    registry.queryUtility = queryUtility
+    registry.getUtility = getUtility
+    registry._anemic_lazy_lookups = True
+
+
+def _restore_lookups_when_built(registry):
+    """
+    Remove the lookups installed by `_install_lazy_lookups` once every lazy
+    service has been built and registered, so that the utility lookups of
+    Pyramid itself are not slowed down for the lifetime of the application.
+    """
+    if not getattr(registry, "_anemic_lazy_lookups", False):
+        return
+
+    lazy_services = get_service_registry(registry)._lazy_services
+    if any(s.instance is _unbuilt for s in list(lazy_services.values())):
+        return
+
+    registry._anemic_lazy_lookups = False
+    vars(registry).pop("queryUtility", None)
+    vars(registry).pop("getUtility", None)
 
 
 def get_service_registry(registry):
@@ -45,9 +170,54 @@ def register_anemic_service(
     interface=Interface,
     name="",
     context_iface=Interface,
+    lazy: bool | None = None,
+    eager: bool = False,
 ):
+    """
+    Register a service. Global services are built immediately, unless
+    `lazy` is true, in which case they are built on first lookup. If `lazy`
+    is not given, the ``anemic.lazy_services`` setting is used. Lazy
+    services registered with ``eager=True`` are built by
+    ``config.warm_services()``.
+    """
     registry = config.registry
-    if scope == "global":
+    # with anemic.web.ioc included, the services live in its containers;
+    # the containers do not discriminate by context interfaces, so services
+    # registered for one are left to pyramid_services
+    use_containers = (
+        ioc.get_registry_set(registry) is not None and context_iface is Interface
+    )
+    if lazy is None:
+        lazy = asbool((registry.settings or {}).get("anemic.lazy_services", False))
+
+    services = get_service_registry(registry)
+    if scope == "global" and lazy:
+        # register only once
+        if (interface, name) in services._lazy_services or (
+            registry.queryUtility(interface, name=name) is not None
+        ):
+            return
+
+        lazy_service = _LazyService(registry, service_factory, interface, name, eager)
+        services._register_lazy_service(lazy_service)
+        _install_lazy_lookups(registry)
+
+        # noinspection PyUnusedLocal
+        def lazy_factory(context, request):
+            return lazy_service.get()
+
+        config.register_service_factory(
+            lazy_factory, interface, context_iface, name=name
+        )
+        if use_containers:
+            ioc.register_global_service(
+                registry,
+                lambda container: lazy_service.get(),
+                interface=interface,
+                name=name,
+            )
+
+    elif scope == "global":
         # register only once
         if registry.queryUtility(interface, name=name) is None:
             ob_instance = service_factory(registry=registry)
@@ -60,6 +230,26 @@ def register_anemic_service(
             config.register_service(
                 service=ob_instance, iface=interface, context=context_iface, name=name
             )
+            if use_containers:
+                ioc.register_global_service(
+                    registry,
+                    lambda container: ob_instance,
+                    interface=interface,
+                    name=name,
+                )
+
+    elif use_containers:
+        ioc.register_request_service(
+            registry, service_factory, interface=interface, name=name
+        )
+
+        # noinspection PyUnusedLocal
+        def container_factory(context, request):
+            return request.container.get(interface=interface, name=name)
+
+        config.register_service_factory(
+            container_factory, interface, context_iface, name=name
+        )
 
     else:
         # noinspection PyUnusedLocal
@@ -71,7 +261,14 @@ def register_anemic_service(
         )
 
 
-def service(interface=Interface, name="", context_iface=Interface, scope="global"):
+def service(
+    interface=Interface,
+    name="",
+    context_iface=Interface,
+    scope="global",
+    lazy: bool | None = None,
+    eager: bool = False,
+):
     if scope not in {"global", "request"}:
         raise ValueError(
             "Invalid scope {}, must be either 'global' or 'request'".format(scope)
@@ -88,6 +285,8 @@ def service(interface=Interface, name="", context_iface=Interface, scope="global
                 interface=interface,
                 context_iface=context_iface,
                 scope=scope,
+                lazy=lazy,
+                eager=eager,
             )
 
         venusian.attach(wrapped, callback, category="anemic.service")
@@ -100,12 +299,30 @@ T = TypeVar("T", bound=object)
 
 
 def autowired(interface: Type[T] = Interface, name: str = "") -> reify_attr[T]:
+    """
+    An attribute that resolves a service, from the containers of
+    `anemic.web.ioc` if it has been included. Services that are not
+    registered in the containers, e.g. ones registered directly with
+    ``config.register_service``, are found with ``request.find_service`` or
+    ``registry.getUtility``.
+    """
+
     @reify_attr[T]
     def getter(self) -> T:
         if hasattr(self, "request"):
+            container = getattr(self.request, "container", None)
+            if container is not None and container.provides(
+                interface=interface, name=name
+            ):
+                return container.get(interface=interface, name=name)
+
             # remove context discrimination. It didn't work anyway.
             return self.request.find_service(interface, None, name)
 
+        container = getattr(self.registry, "container", None)
+        if container is not None and container.provides(interface=interface, name=name):
+            return container.get(interface=interface, name=name)
+
         return self.registry.getUtility(interface, name)
 
     return getter
@@ -141,8 +358,36 @@ def scan_services(config, *a, **kw):
     return config.scan(*a, **kw)
 
 
+def warm_services(config, *, max_workers: int | None = None) -> list[WarmUpTiming]:
+    """
+    Build the lazy global services registered with ``eager=True`` in a
+    thread pool. Call after the services have been scanned.
+
+    :param max_workers: The number of threads to use
+    :return: The time it took to build each service
+    """
+
+    def build(lazy_service: _LazyService) -> WarmUpTiming:
+        start = time.perf_counter()
+        lazy_service.get()
+        return WarmUpTiming(
+            lazy_service.interface, lazy_service.name, time.perf_counter() - start
+        )
+
+    lazy_services = get_service_registry(config.registry)._lazy_services
+    eager = [
+        lazy_service for lazy_service in lazy_services.values() if lazy_service.eager
+    ]
+    if not eager:
+        return []
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(build, eager))
+
+
 def includeme(config):
     config.include("pyramid_services")
     config.add_directive("scan_services", scan_services)
     config.add_directive("register_anemic_service", register_anemic_service)
+    config.add_directive("warm_services", warm_services)
     config.registry.services = ServiceRegistry()
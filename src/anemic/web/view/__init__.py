@@ -3,9 +3,15 @@ import venusian
 from inspect import isclass
 
 from pyramid.request import Request
+
+# unlike anemic.web.config, this module cannot defer importing Pyramid:
+# view_config and ServiceViews subclass pyramid.view.view_config and
+# RequestScopedBaseService (whose module imports pyramid.config) when the
+# module is imported. The re-export of the names of pyramid.view therefore
+# costs nothing more.
 from pyramid.view import *
 from pyramid.view import view_config as _pyramid_view_config
-from anemic.services import RequestScopedBaseService
+from anemic.web.services import RequestScopedBaseService
 
 
 class view_config(_pyramid_view_config):
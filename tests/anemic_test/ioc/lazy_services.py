@@ -0,0 +1,14 @@
+from anemic.ioc import Container
+from .services import Renderer
+
+
+class PdfRenderer(Renderer):
+    def __init__(self, container: Container):
+        self.container = container
+
+    def render(self) -> str:
+        return "%PDF"
+
+
+def dispose_renderer(renderer: PdfRenderer) -> None:
+    renderer.disposed = True
@@ -0,0 +1,27 @@
+"""
+Services for the tests of `FactoryRegistry.register_in_processes`; the
+worker processes import this module to bootstrap the registry set.
+"""
+import os
+
+from anemic.ioc import FactoryRegistrySet
+
+
+class Renderer:
+    def __init__(self, container):
+        pass
+
+    def render(self, text: str, *, times: int = 1) -> tuple[str, int]:
+        return text * times, os.getpid()
+
+
+def make_registry_set() -> FactoryRegistrySet:
+    registry_set = FactoryRegistrySet()
+    registry_set.create_registry(scope="application")
+    registry_set.get_registry("application").register_in_processes(
+        interface=Renderer,
+        factory=Renderer,
+        bootstrap="anemic_test.ioc.process_services:make_registry_set",
+        max_workers=1,
+    )
+    return registry_set
@@ -26,3 +26,24 @@ class Foo:
 
     def delegate_to_named(self) -> str:
         return f"delegated to named: {self.named_bar.delegate()}"
+
+
+def close_connection(connection: "Connection") -> None:
+    connection.close()
+
+
+@service(scope="request", disposer=close_connection)
+class Connection:
+    closed = False
+
+    def __init__(self, container: Container):
+        self.container = container
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@service(scope="application", factory="anemic_test.ioc.lazy_services:PdfRenderer")
+class Renderer:
+    def render(self) -> str:
+        raise NotImplementedError
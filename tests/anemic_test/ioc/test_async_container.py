@@ -0,0 +1,294 @@
+import asyncio
+import threading
+
+from pytest import raises
+
+from anemic.ioc import (
+    AsyncContainer,
+    FactoryRegistry,
+    aautowired,
+    auto,
+    autowired,
+    autowired_slots,
+)
+
+
+class Database:
+    def __init__(self, container):
+        self.container = container
+
+
+class HttpClient:
+    def __init__(self, container):
+        self.container = container
+
+
+class Repository:
+    database: Database = autowired(auto, batch=True)
+    http: HttpClient = aautowired(auto)
+
+    def __init__(self, container):
+        self.container = container
+
+
+def _rendezvous_factory(cls, started, everyone_started, parties):
+    """
+    A factory that completes only when `parties` factories are running at
+    the same time.
+    """
+
+    async def factory(container):
+        started.append(cls)
+        if len(started) == parties:
+            everyone_started.set()
+
+        await asyncio.wait_for(everyone_started.wait(), 5)
+        return cls(container)
+
+    return factory
+
+
+def test_async_factories_and_concurrent_autowiring():
+    started = []
+    request_registry = FactoryRegistry("request")
+    request_registry.register(interface=Repository, factory=Repository)
+
+    async def main():
+        everyone_started = asyncio.Event()
+        application_registry = FactoryRegistry("application")
+        for cls in Database, HttpClient:
+            application_registry.register(
+                interface=cls,
+                factory=_rendezvous_factory(cls, started, everyone_started, 2),
+            )
+
+        app_container = AsyncContainer(application_registry)
+        request_container = AsyncContainer(request_registry, app_container)
+
+        # the factories wait for each other, so the dependencies can only be
+        # constructed concurrently
+        repository = await request_container.aget(interface=Repository)
+        assert sorted(c.__name__ for c in started) == ["Database", "HttpClient"]
+
+        assert repository.database is app_container.get(interface=Database)
+        assert await repository.http is await app_container.aget(interface=HttpClient)
+        # the awaitable attribute can be awaited repeatedly
+        assert await repository.http is await repository.http
+
+    asyncio.run(main())
+
+
+def test_async_construction_is_single_flight():
+    calls = 0
+
+    async def factory(container):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    application_registry = FactoryRegistry("application")
+    application_registry.register(name="pool", factory=factory)
+
+    async def main():
+        container = AsyncContainer(application_registry)
+        results = await asyncio.gather(
+            *(container.aget(name="pool") for _ in range(10))
+        )
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+
+    asyncio.run(main())
+
+
+def test_async_construction_failure_is_delivered_to_all_waiters():
+    calls = 0
+
+    async def factory(container):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("no pool for you")
+
+    application_registry = FactoryRegistry("application")
+    application_registry.register(name="pool", factory=factory)
+
+    async def main():
+        container = AsyncContainer(application_registry)
+        results = await asyncio.gather(
+            *(container.aget(name="pool") for _ in range(10)),
+            return_exceptions=True,
+        )
+        assert calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+    asyncio.run(main())
+
+
+class Chicken:
+    egg: "Egg" = autowired(auto, batch=True)
+
+    def __init__(self, container):
+        self.container = container
+
+
+class Egg:
+    chicken: Chicken = aautowired(auto)
+
+    def __init__(self, container):
+        self.container = container
+
+
+def test_async_services_can_autowire_each_other():
+    registry = FactoryRegistry("application")
+    registry.register(interface=Chicken, factory=Chicken)
+    registry.register(interface=Egg, factory=Egg)
+
+    async def main():
+        container = AsyncContainer(registry)
+        chicken = await asyncio.wait_for(container.aget(interface=Chicken), 2)
+        egg = container.get(interface=Egg)
+        # both attributes were prefetched
+        assert vars(chicken)["egg"] is egg
+        assert await egg.chicken is chicken
+
+    asyncio.run(main())
+
+
+class Optional_:
+    pass
+
+
+class Lenient:
+    optional: Optional_ = autowired(auto)
+    missing: Optional_ = aautowired(Optional_, name="missing")
+
+    def __init__(self, container):
+        self.container = container
+
+
+def test_unresolvable_autowired_attributes_fail_on_use():
+    registry = FactoryRegistry("application")
+    registry.register(interface=Lenient, factory=Lenient)
+
+    async def main():
+        container = AsyncContainer(registry)
+        lenient = await container.aget(interface=Lenient)
+        assert await container.aget(interface=Lenient) is lenient
+        assert container.get(interface=Lenient) is lenient
+
+        # plain autowired attributes are not prefetched
+        assert "optional" not in vars(lenient)
+        with raises(LookupError):
+            lenient.optional
+
+        with raises(LookupError):
+            await lenient.missing
+
+    asyncio.run(main())
+
+
+def test_sync_get_does_not_construct_a_service_under_async_construction():
+    calls = 0
+    constructing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def factory(container):
+        nonlocal calls
+        calls += 1
+        constructing.set()
+        await release.wait()
+        return object()
+
+    registry = FactoryRegistry("application")
+    registry.register(name="pool", factory=lambda c: factory(c))
+
+    async def main():
+        container = AsyncContainer(registry)
+        task = asyncio.create_task(container.aget(name="pool"))
+        await constructing.wait()
+
+        with raises(RuntimeError, match="asynchronously"):
+            container.get(name="pool")
+
+        release.set()
+        service = await task
+        assert calls == 1
+        assert container.get(name="pool") is service
+
+    asyncio.run(main())
+
+
+def test_async_get_waits_for_a_synchronous_construction():
+    constructing = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def factory(container):
+        nonlocal calls
+        calls += 1
+        constructing.set()
+        release.wait(5)
+        return object()
+
+    registry = FactoryRegistry("application")
+    registry.register(name="pool", factory=factory)
+    container = AsyncContainer(registry)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(container.get(name="pool")))
+    thread.start()
+    constructing.wait(5)
+
+    async def main():
+        waiter = asyncio.create_task(container.aget(name="pool"))
+        await asyncio.sleep(0)
+        release.set()
+        return await waiter
+
+    service = asyncio.run(main())
+    thread.join()
+    assert calls == 1
+    assert results == [service]
+
+
+def test_sync_get_refuses_async_factories():
+    async def factory(container):
+        return object()
+
+    application_registry = FactoryRegistry("application")
+    application_registry.register(name="async", factory=factory)
+    application_registry.register(name="sync", factory=lambda c: "sync")
+
+    container = AsyncContainer(application_registry)
+    assert container.get(name="sync") == "sync"
+
+    with raises(TypeError):
+        container.get(name="async")
+
+    with raises(LookupError):
+        asyncio.run(container.aget(name="missing"))
+
+
+def test_slotted_services_are_autowired_concurrently():
+    @autowired_slots
+    class SlottedRepository:
+        __slots__ = ("container",)
+
+        database: Database = autowired(auto, batch=True)
+        http: HttpClient = aautowired(auto)
+
+        def __init__(self, container):
+            self.container = container
+
+    registry = FactoryRegistry("application")
+    registry.register(interface=Database, factory=Database)
+    registry.register(interface=HttpClient, factory=HttpClient)
+    registry.register(interface=SlottedRepository, factory=SlottedRepository)
+
+    async def main():
+        container = AsyncContainer(registry)
+        repository = await container.aget(interface=SlottedRepository)
+        assert repository._autowired_database is container.get(interface=Database)
+        assert await repository.http is await container.aget(interface=HttpClient)
+
+    asyncio.run(main())
@@ -1,4 +1,14 @@
 # generate unitttests for anemic.ioc.container
+import asyncio
+import gc
+import io
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import weakref
 from itertools import count
 from unittest.mock import sentinel
 
@@ -8,9 +18,12 @@ from anemic.ioc import (
     Container,
     FactoryRegistry,
     autowired,
+    autowired_slots,
     auto,
     FactoryRegistrySet,
+    ContextCacheInfo,
 )
+from anemic.ioc import manifest
 
 
 def test_ioc_container():
@@ -148,6 +161,48 @@ def test_contexts():
     assert request_container.get(context=BarContext(1), name="foo").id == 3
 
 
+def test_context_caches_are_released_with_contexts():
+    request_registry = FactoryRegistry("request", supports_contexts=True)
+    request_registry.register(name="foo", context_type=object, factory=lambda c: [])
+
+    class Context:
+        pass
+
+    container = Container(request_registry)
+    context = Context()
+    first = container.get(name="foo", context=context)
+    for _ in range(1000):
+        assert container.get(name="foo", context=context) is first
+
+    # a single weak registration per context, however often it is resolved
+    assert container.context_cache_info() == ContextCacheInfo(1, None, 0)
+    assert weakref.getweakrefcount(context) == 1
+
+    del context
+    gc.collect()
+    assert container.context_cache_info().contexts == 0
+
+
+def test_context_caches_lru_eviction():
+    request_registry = FactoryRegistry("request", supports_contexts=True)
+    request_registry.register(name="foo", context_type=object, factory=lambda c: [])
+
+    class Context:
+        pass
+
+    container = Container(request_registry, max_contexts=2)
+    a, b, c = Context(), Context(), Context()
+
+    foo_a = container.get(name="foo", context=a)
+    container.get(name="foo", context=b)
+    # touch a so that b is the least recently used
+    assert container.get(name="foo", context=a) is foo_a
+    container.get(name="foo", context=c)
+
+    assert container.context_cache_info() == ContextCacheInfo(2, 2, 1)
+    assert container.get(name="foo", context=a) is foo_a
+
+
 def test_container_raises_when_illegal_context():
     application_registry = FactoryRegistry("application")
     with raises(TypeError):
@@ -230,6 +285,592 @@ def test_autowired():
     )
 
 
+def test_resolution_plans_are_shared_and_invalidated():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+
+    application_registry.register(name="foo", factory=lambda c: ("app", c.scope))
+
+    app_container = Container(application_registry)
+    request_container = Container(request_registry, app_container)
+    assert request_container.get(name="foo") == ("app", "application")
+
+    # containers with the same registry chain share the compiled plans
+    request_container2 = Container(request_registry, app_container)
+    assert request_container2._plans is request_container._plans
+    assert (object, "foo", None) in request_container2._plans
+
+    # mutating any registry in the chain discards the plans
+    version = request_registry.version
+    request_registry.register(name="foo", factory=lambda c: ("request", c.scope))
+    assert request_registry.version == version + 1
+    assert not request_container._plans
+
+    assert request_container2.get(name="foo") == ("request", "request")
+
+    application_registry.register(name="bar", factory=lambda c: "bar")
+    assert not request_container._plans
+    assert request_container.get(name="bar") == "bar"
+
+
+def test_negative_lookups_are_remembered_until_registry_changes():
+    application_registry = FactoryRegistry("application")
+    session_registry = FactoryRegistry("session")
+    request_registry = FactoryRegistry("request", supports_contexts=True)
+    application_registry.register(name="foo", factory=lambda c: "foo")
+
+    app_container = Container(application_registry)
+    session_container = Container(session_registry, app_container)
+    request_container = Container(request_registry, session_container)
+
+    class Context:
+        pass
+
+    assert request_container.get(name="foo", context=Context()) == "foo"
+    assert (object, "foo", Context) in request_registry._misses
+    assert (object, "foo", None) in session_registry._misses
+
+    # the remembered misses are ignored once the registry changes
+    session_registry.register(name="foo", factory=lambda c: "session foo")
+    assert not session_registry._misses
+    assert request_container.get(name="foo", context=Context()) == "session foo"
+
+    with raises(LookupError):
+        request_container.get(name="bar")
+
+    request_registry.register(name="bar", factory=lambda c: "bar")
+    assert request_container.get(name="bar") == "bar"
+
+
+def test_close_disposes_services_in_reverse_creation_order():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+    disposed = []
+
+    application_registry.register(
+        name="engine", factory=lambda c: "engine", disposer=disposed.append
+    )
+    request_registry.register(
+        name="connection", factory=lambda c: "connection", disposer=disposed.append
+    )
+    request_registry.register(
+        name="session",
+        factory=lambda c: c.get(name="connection") and "session",
+        disposer=disposed.append,
+    )
+    request_registry.register(name="plain", factory=lambda c: "plain")
+
+    app_container = Container(application_registry)
+    with Container(request_registry, app_container) as request_container:
+        assert request_container.get(name="session") == "session"
+        assert request_container.get(name="engine") == "engine"
+        assert request_container.get(name="plain") == "plain"
+
+    # the parent container is not closed
+    assert disposed == ["session", "connection"]
+    assert request_container.closed
+    assert not app_container.closed
+
+    with raises(RuntimeError):
+        request_container.get(name="connection")
+
+    # services of the parent can still be resolved
+    assert request_container.get(name="engine") == "engine"
+
+    app_container.close()
+    assert disposed == ["session", "connection", "engine"]
+
+
+def test_close_calls_all_disposers_and_reraises_first_error():
+    registry = FactoryRegistry("request")
+    disposed = []
+
+    def failing_disposer(service):
+        raise ValueError(service)
+
+    registry.register(name="a", factory=lambda c: "a", disposer=disposed.append)
+    registry.register(name="b", factory=lambda c: "b", disposer=failing_disposer)
+    registry.register(name="c", factory=lambda c: "c", disposer=failing_disposer)
+
+    container = Container(registry)
+    for name in "abc":
+        container.get(name=name)
+
+    with raises(ValueError, match="c"):
+        container.close()
+
+    assert disposed == ["a"]
+
+
+def test_aclose_awaits_asynchronous_disposers():
+    registry = FactoryRegistry("request")
+    disposed = []
+
+    async def disposer(service):
+        await asyncio.sleep(0)
+        disposed.append(service)
+
+    registry.register(name="a", factory=lambda c: "a", disposer=disposer)
+    registry.register(name="b", factory=lambda c: "b", disposer=disposed.append)
+
+    async def main():
+        async with Container(registry) as container:
+            container.get(name="a")
+            container.get(name="b")
+
+    asyncio.run(main())
+    assert disposed == ["b", "a"]
+
+    container = Container(registry)
+    container.get(name="a")
+    with raises(TypeError):
+        container.close()
+
+
+def test_warm_up_builds_services_in_dependency_order():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+    order = []
+    lock = threading.Lock()
+    # the two slow factories complete only when they run at the same time
+    both_running = threading.Barrier(2, timeout=5)
+
+    def slow(label):
+        def factory(container):
+            both_running.wait()
+            with lock:
+                order.append(label)
+            return label
+
+        return factory
+
+    class Engine:
+        def __init__(self, container):
+            self.container = container
+            with lock:
+                order.append("engine")
+
+    class Repository:
+        engine: Engine = autowired(auto)
+        vocabulary: str = autowired(str, name="vocabulary")
+
+        def __init__(self, container):
+            self.container = container
+            with lock:
+                order.append("repository")
+
+    application_registry.register(interface=Engine, factory=Engine)
+    application_registry.register(interface=Repository, factory=Repository)
+    application_registry.register(
+        interface=str, name="vocabulary", factory=slow("vocabulary")
+    )
+    application_registry.register(name="regexes", factory=slow("regexes"))
+    request_registry.register(name="request only", factory=slow("request only"))
+
+    app_container = Container(application_registry)
+    request_container = Container(request_registry, app_container)
+
+    timings = request_container.warm_up(scope="application", max_workers=4)
+
+    assert order.index("repository") > order.index("engine")
+    assert order.index("repository") > order.index("vocabulary")
+    assert "request only" not in order
+    assert {(t.interface, t.name) for t in timings} == {
+        (Engine, ""),
+        (Repository, ""),
+        (str, "vocabulary"),
+        (object, "regexes"),
+    }
+    assert all(t.seconds >= 0 for t in timings)
+
+    assert app_container.get(name="regexes") == "regexes"
+    assert order.count("regexes") == 1
+
+    with raises(LookupError):
+        request_container.warm_up(scope="session")
+
+
+def test_warm_up_reraises_factory_errors():
+    registry = FactoryRegistry("application")
+
+    def failing(container):
+        raise ValueError("no vocabulary")
+
+    registry.register(name="ok", factory=lambda c: "ok")
+    registry.register(name="failing", factory=failing)
+
+    container = Container(registry)
+    with raises(ValueError):
+        container.warm_up()
+
+
+def test_factories_by_dotted_name_are_imported_on_first_use():
+    sys.modules.pop("anemic_test.ioc.lazy_services", None)
+    registry = FactoryRegistry("application")
+    registry.register(
+        interface=services.Renderer,
+        factory="anemic_test.ioc.lazy_services:PdfRenderer",
+        disposer="anemic_test.ioc.lazy_services.dispose_renderer",
+    )
+    assert "anemic_test.ioc.lazy_services" not in sys.modules
+
+    container = Container(registry)
+    results = _resolve_concurrently(container, interface=services.Renderer)
+    assert all(r is results[0] for r in results)
+    assert results[0].render() == "%PDF"
+    assert "anemic_test.ioc.lazy_services" in sys.modules
+
+    container.close()
+    assert results[0].disposed
+
+
+def test_frozen_registries():
+    registry_set = FactoryRegistrySet()
+    application_registry = registry_set.create_registry("application")
+    request_registry = registry_set.create_registry("request", supports_contexts=True)
+    application_registry.register(name="foo", factory=lambda c: "foo")
+    request_registry.register(
+        name="bar", context_type=object, factory=lambda c: "bar", disposer=print
+    )
+
+    registry_set.freeze()
+    assert application_registry.frozen and request_registry.frozen
+
+    with raises(RuntimeError):
+        application_registry.register(name="baz", factory=lambda c: "baz")
+
+    with raises(RuntimeError):
+        request_registry.register_singleton(name="baz", singleton="baz")
+
+    with raises(RuntimeError):
+        registry_set.create_registry("session")
+
+    request_container = Container(request_registry, Container(application_registry))
+    assert request_container.get(name="foo") == "foo"
+    assert request_container.get(name="bar", context=request_container) == "bar"
+    assert request_container._plans[object, "bar", Container].disposer is print
+
+    with raises(LookupError):
+        request_container.get(name="baz")
+
+
+def test_get_many():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request", supports_contexts=True)
+    ct = count(1)
+
+    application_registry.register(name="engine", factory=lambda c: next(ct))
+    request_registry.register(
+        name="session", context_type=object, factory=lambda c: next(ct)
+    )
+    request_registry.register(
+        interface=int, context_type=object, factory=lambda c: next(ct)
+    )
+
+    request_container = Container(request_registry, Container(application_registry))
+    assert request_container.get_many(
+        [(object, "session"), (object, "engine"), int], context=request_container
+    ) == (1, 2, 3)
+    assert request_container.get_many(
+        [(object, "engine"), (object, "session"), int], context=request_container
+    ) == (2, 1, 3)
+    assert request_container.get_many([]) == ()
+
+    with raises(LookupError):
+        request_container.get_many([(object, "engine"), (object, "missing")])
+
+
+def test_batched_autowired_attributes():
+    registry = FactoryRegistry("application")
+    registry.register(interface=int, factory=lambda c: 42)
+    registry.register(interface=str, factory=lambda c: "answer")
+    registry.register(interface=str, name="other", factory=lambda c: "other")
+
+    calls = []
+
+    class CountingContainer(Container):
+        def get_many(self, requests, *, context=None):
+            calls.append(list(requests))
+            return super().get_many(requests, context=context)
+
+    class Service:
+        number: int = autowired(auto, batch=True)
+        text: str = autowired(auto, batch=True)
+        other: str = autowired(str, name="other")
+
+        def __init__(self, container):
+            self.container = container
+
+    service = Service(CountingContainer(registry))
+    assert service.text == "answer"
+    assert calls == [[(int, ""), (str, "")]]
+    assert service.number == 42
+    assert service.other == "other"
+    assert len(calls) == 1
+
+
+def test_autowired_hints_are_evaluated_lazily_once_per_class(monkeypatch):
+    from anemic.ioc import container as container_module
+
+    evaluated = []
+    get_type_hints = container_module.get_type_hints
+
+    def counting_get_type_hints(cls):
+        evaluated.append(cls)
+        return get_type_hints(cls)
+
+    monkeypatch.setattr(container_module, "get_type_hints", counting_get_type_hints)
+
+    class Service:
+        # forward references that are defined only after the class
+        first: "LateDependency" = autowired(auto)
+        second: "LateDependency" = autowired(auto, name="second")
+        third: int = autowired(auto)
+
+        def __init__(self, container):
+            self.container = container
+
+    assert evaluated == []
+
+    class LateDependency:
+        pass
+
+    # make the forward reference resolvable from the module globals
+    monkeypatch.setitem(globals(), "LateDependency", LateDependency)
+
+    registry = FactoryRegistry("application")
+    registry.register(interface=LateDependency, factory=lambda c: "first")
+    registry.register(interface=LateDependency, name="second", factory=lambda c: "2")
+    registry.register(interface=int, factory=lambda c: 3)
+
+    service = Service(Container(registry))
+    assert (service.first, service.second, service.third) == ("first", "2", 3)
+    assert evaluated == [Service]
+
+
+def test_autowired_in_slotted_classes():
+    registry = FactoryRegistry("application")
+    registry.register(interface=int, factory=lambda c: 42)
+    registry.register(interface=str, factory=lambda c: "answer")
+
+    class Explicit:
+        __slots__ = ("container", "_number")
+
+        number: int = autowired(auto, slot="_number")
+
+        def __init__(self, container):
+            self.container = container
+
+    @autowired_slots
+    class Generated:
+        __slots__ = ("container",)
+
+        number: int = autowired(auto, batch=True)
+        text: str = autowired(auto, batch=True)
+
+        def __init__(self, container):
+            super().__init__()
+            self.container = container
+
+    container = Container(registry)
+    explicit = Explicit(container)
+    assert explicit.number == 42 and explicit._number == 42
+    assert not hasattr(explicit, "__dict__")
+
+    generated = Generated(container)
+    assert not hasattr(generated, "__dict__")
+    assert (generated.number, generated.text) == (42, "answer")
+    assert generated._autowired_text == "answer"
+    assert Generated.__slots__ == ("container", "_autowired_number", "_autowired_text")
+
+    with raises(TypeError):
+
+        @autowired_slots
+        class Unslotted:
+            number: int = autowired(auto)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_reinitializes_locks_and_runs_after_fork_hooks():
+    from anemic.ioc import container as container_module
+
+    class Engine:
+        def __init__(self, container):
+            self.pid = os.getpid()
+
+    registry = FactoryRegistry("application")
+    registry.register(
+        interface=Engine,
+        factory=Engine,
+        after_fork=lambda engine: setattr(engine, "pid", os.getpid()),
+    )
+    registry.register(interface=int, factory=lambda c: 42)
+    container = Container(registry)
+    engine = container.get(interface=Engine)
+
+    # another thread holds the plan lock while the process forks
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_plan_lock():
+        with container_module._plan_lock:
+            locked.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_plan_lock)
+    holder.start()
+    locked.wait()
+    try:
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            try:
+                signal.alarm(5)
+                ok = engine.pid == os.getpid() and container.get(interface=int) == 42
+                os.write(write_end, b"ok" if ok else b"fail")
+            finally:
+                os._exit(0)
+    finally:
+        release.set()
+        holder.join()
+
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_end, "rb") as result:
+        assert result.read() == b"ok"
+
+    assert engine.pid == os.getpid()
+
+
+def test_forked_child_reinitializes_memo_and_stats_locks():
+    from anemic.ioc import ResolutionStats, container_memoize
+
+    class Prices:
+        def __init__(self, container):
+            self.container = container
+
+        @container_memoize()
+        def price(self, product):
+            return len(product)
+
+    registry = FactoryRegistry("application")
+    registry.register(interface=Prices, factory=Prices)
+    container = Container(registry)
+    stats = ResolutionStats()
+    container.add_observer(stats)
+    prices = container.get(interface=Prices)
+    # the memo behind the decorated method
+    memo_lock = Prices.price.stats.__self__.lock
+
+    # another thread holds the locks while the process forks
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_locks():
+        with memo_lock, stats.lock:
+            locked.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_locks)
+    holder.start()
+    locked.wait()
+    try:
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            try:
+                signal.alarm(5)
+                ok = (
+                    prices.price("abc") == 3
+                    and container.get(interface=Prices) is prices
+                )
+                os.write(write_end, b"ok" if ok else b"fail")
+            finally:
+                os._exit(0)
+    finally:
+        release.set()
+        holder.join()
+
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_end, "rb") as result:
+        assert result.read() == b"ok"
+
+
+def _resolve_concurrently(container, n_threads=8, **kwargs):
+    barrier = threading.Barrier(n_threads)
+    results = [None] * n_threads
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = container.get(**kwargs)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    return results
+
+
+def test_concurrent_construction_is_single_flight():
+    application_registry = FactoryRegistry("application")
+    calls = 0
+
+    def slow_factory(container):
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        return object()
+
+    application_registry.register(name="pool", factory=slow_factory)
+    app_container = Container(application_registry)
+    request_container = Container(FactoryRegistry("request"), app_container)
+
+    results = _resolve_concurrently(request_container, name="pool")
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_concurrent_construction_failure_is_delivered_to_all_waiters():
+    application_registry = FactoryRegistry("application")
+    calls = 0
+
+    def failing_factory(container):
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        raise ValueError("no pool for you")
+
+    application_registry.register(name="pool", factory=failing_factory)
+    app_container = Container(application_registry)
+
+    results = _resolve_concurrently(app_container, name="pool")
+    assert calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+    # a failed construction is not cached
+    with raises(ValueError):
+        app_container.get(name="pool")
+
+    assert calls == 2
+
+
+def test_circular_construction_raises():
+    application_registry = FactoryRegistry("application")
+    application_registry.register(
+        name="loop", factory=lambda container: container.get(name="loop")
+    )
+
+    with raises(RuntimeError):
+        Container(application_registry).get(name="loop")
+
+
 try:
     import venusian
 except ImportError:
@@ -271,3 +912,104 @@ def test_service_decorator():
         req_cont_1.get(interface=services.Foo).delegate_to_named()
         == "delegated to named: 1"
     )
+
+    # the implementation of the renderer is imported on first use
+    assert req_cont_1.get(interface=services.Renderer).render() == "%PDF"
+
+    connection = req_cont_1.get(interface=services.Connection)
+    req_cont_1.close()
+    assert connection.closed
+
+
+@pytest.mark.skipif(venusian is None, reason="venusian not installed")
+def test_scan_manifest():
+    registry_set = FactoryRegistrySet()
+    registry_set.create_registry("application")
+    registry_set.create_registry("request")
+    registry_set.scan_services(services)
+
+    stream = io.StringIO()
+    registry_set.write_manifest(stream)
+    manifest = json.loads(stream.getvalue())
+    assert {
+        "scope": "request",
+        "interface": "anemic_test.ioc.services:Connection",
+        "name": "",
+        "context_type": None,
+        "factory": "anemic_test.ioc.services:Connection",
+        "disposer": "anemic_test.ioc.services:close_connection",
+        "after_fork": None,
+    } in manifest["registrations"]
+    assert {
+        "scope": "application",
+        "interface": "anemic_test.ioc.services:Renderer",
+        "name": "",
+        "context_type": None,
+        "factory": "anemic_test.ioc.lazy_services:PdfRenderer",
+        "disposer": None,
+        "after_fork": None,
+    } in manifest["registrations"]
+    assert "anemic_test.ioc.services" in manifest["modules"]
+
+    loaded_set = FactoryRegistrySet()
+    application_scope_registry = loaded_set.create_registry("application")
+    request_scope_registry = loaded_set.create_registry("request")
+    loaded_set.load_manifest(io.StringIO(stream.getvalue()), check_mtimes=True)
+
+    app_container = Container(application_scope_registry)
+    req_cont = Container(request_scope_registry, parent=app_container)
+    assert req_cont.get(interface=services.Foo).delegate() == "delegated: 1"
+
+    connection = req_cont.get(interface=services.Connection)
+    req_cont.close()
+    assert connection.closed
+
+    manifest["modules"]["anemic_test.ioc.services"] -= 1
+    with raises(RuntimeError, match="stale"):
+        FactoryRegistrySet().load_manifest(
+            io.StringIO(json.dumps(manifest)), check_mtimes=True
+        )
+
+
+def test_manifest_requires_importable_objects():
+    registry_set = FactoryRegistrySet()
+    registry_set.create_registry("application")
+
+    class Local:
+        pass
+
+    registry_set._scanned.append(
+        manifest.ManifestEntry("application", Local, "", None, Local, None)
+    )
+    with raises(ValueError):
+        registry_set.write_manifest(io.StringIO())
+
+
+def test_services_registered_in_processes_run_in_worker_processes():
+    from anemic.ioc import ProcessProxy
+    from .process_services import Renderer, make_registry_set
+
+    registry_set = make_registry_set()
+    with Container(registry_set.get_registry("application")) as container:
+        renderer = container.get(interface=Renderer)
+        assert isinstance(renderer, ProcessProxy)
+
+        text, pid = renderer.render("ab", times=2)
+        assert text == "abab" and pid != os.getpid()
+        assert renderer.submit("render", "c").result()[1] == pid
+        assert asyncio.run(renderer.acall("render", "d"))[0] == "d"
+
+    # closing the container shut the workers down
+    assert renderer._executor is None
+
+
+def test_provides_reports_registrations_without_constructing():
+    calls = []
+    application_registry = FactoryRegistry("application")
+    application_registry.register(name="engine", factory=calls.append)
+    request_registry = FactoryRegistry("request")
+    container = Container(request_registry, Container(application_registry))
+
+    assert container.provides(name="engine")
+    assert not container.provides(name="missing")
+    assert calls == []
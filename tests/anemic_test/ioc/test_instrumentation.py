@@ -0,0 +1,114 @@
+import asyncio
+import io
+
+from anemic.ioc import (
+    AsyncContainer,
+    Container,
+    FactoryRegistrySet,
+    ResolutionObserver,
+    ResolutionStats,
+)
+
+
+class Context:
+    pass
+
+
+def _make_registries():
+    registry_set = FactoryRegistrySet()
+    application_registry = registry_set.create_registry("application")
+    request_registry = registry_set.create_registry("request", supports_contexts=True)
+    application_registry.register(name="engine", factory=lambda c: "engine")
+    request_registry.register(
+        name="session", context_type=Context, factory=lambda c: "session"
+    )
+    return registry_set, application_registry, request_registry
+
+
+def test_resolution_stats():
+    registry_set, application_registry, request_registry = _make_registries()
+    stats = ResolutionStats()
+    registry_set.add_observer(stats)
+
+    app_container = Container(application_registry)
+    request_container = Container(request_registry, app_container)
+    context = Context()
+
+    for _ in range(3):
+        assert request_container.get(name="engine") == "engine"
+        assert request_container.get(name="session", context=context) == "session"
+
+    counters = stats.counters()
+    assert counters["miss", "application", object, "engine"] == 1
+    assert counters["hit", "application", object, "engine"] == 2
+    assert counters["fallthrough", "request", object, "engine"] == 3
+    assert counters["miss", "request", object, "session"] == 1
+    assert counters["hit", "request", object, "session"] == 2
+    assert counters["context", "request", object, "session"] == 3
+
+    latencies = stats.latencies()
+    assert latencies["application", object, "engine"].count == 1
+    assert latencies["request", object, "session"].count == 1
+    assert len(latencies["request", object, "session"].counts) == len(stats.buckets) + 1
+
+    stream = io.StringIO()
+    stats.dump(stream=stream)
+    assert "object named 'engine' in scope 'application'" in stream.getvalue()
+    assert "fallthrough: 3" in stream.getvalue()
+
+    stats.reset()
+    assert not stats.counters()
+
+
+def test_observers_per_container_and_removal():
+    registry_set, application_registry, _ = _make_registries()
+    app_container = Container(application_registry)
+    assert app_container.observer is None
+
+    events = []
+
+    class Recorder(ResolutionObserver):
+        def cache_miss(self, scope, interface, name):
+            events.append(("miss", name))
+
+        def cache_hit(self, scope, interface, name):
+            events.append(("hit", name))
+
+    recorder = Recorder()
+    stats = ResolutionStats()
+    app_container.add_observer(recorder)
+    app_container.add_observer(stats)
+    app_container.get(name="engine")
+    app_container.get(name="engine")
+    assert events == [("miss", "engine"), ("hit", "engine")]
+    assert stats.counters()["hit", "application", object, "engine"] == 1
+
+    app_container.remove_observer(recorder)
+    app_container.remove_observer(stats)
+    assert app_container.observer is None
+    app_container.get(name="engine")
+    assert len(events) == 2
+
+
+def test_async_resolution_is_observed():
+    registry_set, application_registry, _ = _make_registries()
+
+    async def factory(container):
+        await asyncio.sleep(0)
+        return "pool"
+
+    application_registry.register(name="pool", factory=factory)
+    stats = ResolutionStats()
+    registry_set.add_observer(stats)
+
+    async def main():
+        container = AsyncContainer(application_registry)
+        assert await container.aget(name="pool") == "pool"
+        assert await container.aget(name="pool") == "pool"
+
+    asyncio.run(main())
+    assert stats.counters()["hit", "application", object, "pool"] == 1
+    assert stats.latencies()["application", object, "pool"].count == 1
+
+    registry_set.remove_observer(stats)
+    assert Container(application_registry).observer is None
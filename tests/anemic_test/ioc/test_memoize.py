@@ -0,0 +1,133 @@
+import gc
+import weakref
+
+from pytest import raises
+
+from anemic.ioc import Container, FactoryRegistry, MemoStats, container_memoize
+from anemic.ioc import memoize
+
+
+class Prices:
+    def __init__(self, container):
+        self.container = container
+        self.calls = []
+
+    @container_memoize(scope="request")
+    def price(self, product: str, *, quantity: int = 1) -> int:
+        self.calls.append((product, quantity))
+        return 10 * quantity
+
+    @container_memoize(maxsize=2, ttl=60)
+    def discount(self, product: str) -> int:
+        self.calls.append(product)
+        return len(product)
+
+    @container_memoize(scope="missing")
+    def unscoped(self) -> None:
+        pass
+
+
+def test_results_are_cached_in_the_container_of_the_scope():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+    request_registry.register(interface=Prices, factory=Prices)
+    app_container = Container(application_registry)
+
+    before = Prices.price.stats()
+    with Container(request_registry, app_container) as request_container:
+        prices = request_container.get(interface=Prices)
+        assert prices.price("a") == prices.price("a") == 10
+        assert prices.price("a", quantity=2) == 20
+        assert prices.calls == [("a", 1), ("a", 2)]
+
+    # the cache died with the request container
+    with Container(request_registry, app_container) as request_container:
+        prices = request_container.get(interface=Prices)
+        assert prices.price("a") == 10
+        assert prices.calls == [("a", 1)]
+
+    after = Prices.price.stats()
+    assert (after.hits - before.hits, after.misses - before.misses) == (1, 3)
+
+    with raises(LookupError):
+        prices.unscoped()
+
+    # an application scoped service has no request container
+    application_registry.register(interface=Prices, factory=Prices)
+    with raises(LookupError, match="request"):
+        app_container.get(interface=Prices).price("a")
+
+
+titles: list[str] = []
+
+
+class Catalog:
+    def __init__(self, container):
+        self.container = container
+
+    @container_memoize(scope="application")
+    def title(self, product: str) -> str:
+        titles.append(product)
+        return product.title()
+
+
+def test_application_scoped_results_are_shared_by_request_services():
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+    request_registry.register(interface=Catalog, factory=Catalog)
+    app_container = Container(application_registry)
+    titles.clear()
+
+    services = []
+    for _ in range(3):
+        with Container(request_registry, app_container) as request_container:
+            catalog = request_container.get(interface=Catalog)
+            assert catalog.title("shoe") == "Shoe"
+            services.append(weakref.ref(catalog))
+            del catalog
+
+    assert titles == ["shoe"]
+    # the application cache does not keep the request services alive
+    gc.collect()
+    assert [ref() for ref in services] == [None, None, None]
+
+
+def test_results_are_evicted_least_recently_used_first():
+    registry = FactoryRegistry("application")
+    prices = Prices(Container(registry))
+    before = Prices.discount.stats()
+
+    prices.discount("a")
+    prices.discount("bb")
+    prices.discount("a")
+    prices.discount("ccc")
+    prices.discount("bb")
+    assert prices.calls == ["a", "bb", "ccc", "bb"]
+
+    after = Prices.discount.stats()
+    assert after.evictions - before.evictions == 2
+    assert isinstance(after, MemoStats)
+
+
+def test_expired_results_are_recomputed_and_swept(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(memoize.time, "monotonic", lambda: now)
+    registry = FactoryRegistry("application")
+    container = Container(registry)
+    prices = Prices(container)
+    before = Prices.discount.stats()
+
+    prices.discount("a")
+    now += 61
+    assert prices.discount("a") == 1
+    assert prices.calls == ["a", "a"]
+
+    prices.discount("bb")
+    now += 61
+    # caching "ccc" sweeps the expired results that are not looked up again
+    prices.discount("ccc")
+    cache = container._memo_caches[next(iter(container._memo_caches))]
+    assert [key[1:] for key in cache] == [(("ccc",),)]
+
+    after = Prices.discount.stats()
+    assert after.expirations - before.expirations == 3
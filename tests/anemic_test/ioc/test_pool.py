@@ -0,0 +1,99 @@
+import threading
+
+from pytest import raises
+
+from anemic.ioc import Container, FactoryRegistry, PoolStats
+
+
+class Parser:
+    def __init__(self, container):
+        self.buffer = []
+        self.disposed = False
+
+
+def _registries(**pool_options):
+    application_registry = FactoryRegistry("application")
+    request_registry = FactoryRegistry("request")
+    pool = request_registry.register_pooled(
+        interface=Parser,
+        factory=Parser,
+        reset=lambda parser: parser.buffer.clear(),
+        dispose=lambda parser: setattr(parser, "disposed", True),
+        **pool_options,
+    )
+    return Container(application_registry), request_registry, pool
+
+
+def test_pooled_services_are_reused_across_request_containers():
+    app_container, request_registry, pool = _registries(max_size=2)
+    assert request_registry.pools == {(Parser, "", None): pool}
+
+    with Container(request_registry, app_container) as request_container:
+        parser = request_container.get(interface=Parser)
+        assert request_container.get(interface=Parser) is parser
+        parser.buffer.append("data")
+
+    with Container(request_registry, app_container) as request_container:
+        assert request_container.get(interface=Parser) is parser
+        assert parser.buffer == []
+
+    assert pool.stats() == PoolStats(
+        max_size=2,
+        size=1,
+        idle=1,
+        created=1,
+        checkouts=2,
+        waits=0,
+        overflows=0,
+        discarded=0,
+    )
+
+    pool.clear()
+    assert parser.disposed
+    assert pool.stats().size == 0
+
+
+def test_exhausted_pool_overflows():
+    app_container, request_registry, pool = _registries(max_size=1, overflow=True)
+    first = Container(request_registry, app_container)
+    second = Container(request_registry, app_container)
+
+    pooled = first.get(interface=Parser)
+    overflowing = second.get(interface=Parser)
+    assert overflowing is not pooled
+
+    second.close()
+    first.close()
+    assert overflowing.disposed and not pooled.disposed
+    stats = pool.stats()
+    assert (stats.size, stats.idle, stats.overflows, stats.discarded) == (1, 1, 1, 1)
+
+
+def test_exhausted_pool_blocks_until_an_instance_is_returned():
+    app_container, request_registry, pool = _registries(max_size=1, timeout=5)
+    first = Container(request_registry, app_container)
+    pooled = first.get(interface=Parser)
+
+    checked_out = []
+    waiting = threading.Thread(
+        target=lambda: checked_out.append(
+            Container(request_registry, app_container).get(interface=Parser)
+        )
+    )
+    waiting.start()
+    while pool.stats().waits == 0:
+        waiting.join(0.001)
+
+    first.close()
+    waiting.join()
+    assert checked_out == [pooled]
+
+
+def test_exhausted_pool_times_out():
+    app_container, request_registry, pool = _registries(max_size=1, timeout=0.01)
+    Container(request_registry, app_container).get(interface=Parser)
+
+    with raises(TimeoutError):
+        Container(request_registry, app_container).get(interface=Parser)
+
+    assert pool.stats().waits == 1
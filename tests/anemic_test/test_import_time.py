@@ -0,0 +1,140 @@
+# the modules imported by anemic packages, and their import times measured
+# with `python -X importtime`
+import os
+import platform
+import subprocess
+import sys
+
+import pytest
+
+import anemic.ioc
+
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(anemic.ioc.__file__)))
+
+START = "-- start --"
+
+cpython_only = pytest.mark.skipif(
+    platform.python_implementation() != "CPython",
+    reason="-X importtime is a CPython feature",
+)
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [SOURCE_ROOT, env.get("PYTHONPATH")])
+    )
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_modules(code: str) -> set[str]:
+    """
+    The names of the modules loaded after running the code in a fresh
+    interpreter.
+    """
+    result = run(code + "\nimport sys\nprint('\\n'.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+def import_times(code: str) -> dict[str, int]:
+    """
+    The cumulative import times in microseconds of the modules imported
+    at the top level when running the code in a fresh interpreter; the
+    times of the modules they import are included in theirs.
+    """
+    result = run(
+        f"import sys\nprint({START!r}, file=sys.stderr)\n{code}", "-X", "importtime"
+    )
+    _, found, output = result.stderr.partition(START)
+    assert found, result.stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+
+        _, cumulative, name = line.split("|")
+        # modules imported by other modules are indented
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def time_of(times: dict[str, int], module: str) -> int:
+    if module not in times:
+        pytest.fail(f"{module} is missing from the import times: {sorted(times)}")
+
+    return times[module]
+
+
+def test_import_anemic_ioc_is_light():
+    modules = loaded_modules("from anemic.ioc import Container")
+
+    assert "anemic.ioc.container" in modules
+    for heavy in ("asyncio", "multiprocessing", "concurrent.futures", "venusian"):
+        assert heavy not in modules
+
+
+def test_import_anemic_ioc_names_on_demand():
+    modules = loaded_modules(
+        "import anemic.ioc\nanemic.ioc.AsyncContainer\nanemic.ioc.ProcessProxy"
+    )
+    assert "asyncio" in modules
+    assert "anemic.ioc.processes" in modules
+    assert "anemic.ioc.memoize" not in modules
+
+
+def test_import_anemic_web_config_does_not_import_pyramid():
+    modules = loaded_modules("import anemic.web.config")
+
+    assert not any(m == "pyramid" or m.startswith("pyramid.") for m in modules)
+
+
+# the budgets are relative to the time of importing asyncio in the same
+# interpreter, so that they hold on slow or loaded machines; importing
+# anemic.ioc used to import asyncio and more
+
+
+@cpython_only
+def test_import_anemic_ioc_takes_less_than_asyncio():
+    times = import_times("from anemic.ioc import Container\nimport asyncio")
+
+    asyncio_time = time_of(times, "asyncio")
+    assert sum(times.values()) - asyncio_time < asyncio_time
+
+
+@cpython_only
+def test_import_anemic_web_config_takes_less_than_asyncio():
+    times = import_times("import anemic.web.config\nimport asyncio")
+
+    asyncio_time = time_of(times, "asyncio")
+    assert time_of(times, "anemic.web.config") < asyncio_time
+    assert sum(times.values()) - asyncio_time < asyncio_time
+
+
+def test_anemic_web_config_reexports_pyramid_config():
+    pytest.importorskip("pyramid")
+    import pyramid.config
+    import anemic.web.config
+
+    assert anemic.web.config.Configurator is pyramid.config.Configurator
+    with pytest.raises(AttributeError):
+        anemic.web.config.no_such_name
+
+
+def test_anemic_web_config_star_exports_pyramid_config():
+    pytest.importorskip("pyramid")
+    import pyramid.config
+
+    namespace: dict = {}
+    exec("from anemic.web.config import *", namespace)
+    assert namespace["Configurator"] is pyramid.config.Configurator
+    assert "create_configurator" in namespace
+    assert "application_factory" in namespace
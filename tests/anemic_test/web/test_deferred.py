@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from pyramid.config import Configurator
+from webob import Request
+
+from anemic.web.config import ALL_FEATURES, create_configurator
+
+pytest.importorskip("tonnikala")
+
+
+def hello(request):
+    return {"name": "World"}
+
+
+def make_app(**settings):
+    config = Configurator(
+        settings={
+            "tonnikala.search_paths": "anemic_test.web:templates",
+            "anemic.defer_features": "true",
+            **settings,
+        }
+    )
+    config.include("anemic.web.renderers.tonnikala")
+    for extension in "tk", "html":
+        config.add_route(extension, "/" + extension)
+        config.add_view(hello, route_name=extension, renderer="hello." + extension)
+
+    return config.registry, config.make_wsgi_app()
+
+
+def get(app, path):
+    response = Request.blank(path).get_response(app)
+    assert response.status_code == 200
+    return response.text.strip()
+
+
+@pytest.mark.parametrize("defer", ["true", "false"])
+def test_extensions_of_the_setting_are_rendered(defer):
+    registry, app = make_app(
+        **{"tonnikala.extensions": ".html", "anemic.defer_features": defer}
+    )
+    assert get(app, "/html") == "<p>Hello, World!</p>"
+    assert get(app, "/tk") == "<p>Hello, World!</p>"
+
+
+def test_feature_is_activated_once_by_concurrent_requests():
+    registry, app = make_app()
+    feature = registry.anemic_deferred_features["renderers.tonnikala"]
+    assert not feature.active
+    assert not hasattr(registry, "tonnikala_renderer_factory")
+
+    start = threading.Barrier(8, timeout=5)
+    results = []
+
+    def render():
+        start.wait()
+        results.append(get(app, "/tk"))
+
+    threads = [threading.Thread(target=render) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert results == ["<p>Hello, World!</p>"] * 8
+    assert feature.active
+    factory = registry.tonnikala_renderer_factory
+    assert get(app, "/tk") == "<p>Hello, World!</p>"
+    assert registry.tonnikala_renderer_factory is factory
+
+
+def test_features_are_not_deferred_by_default():
+    config = Configurator(settings={})
+    config.include("anemic.web.renderers.tonnikala")
+    assert not hasattr(config.registry, "anemic_deferred_features")
+    assert hasattr(config.registry, "tonnikala_renderer_factory")
+
+
+def test_all_features_can_be_deferred():
+    config = create_configurator(
+        package="anemic_test.web",
+        settings={"anemic.defer_features": "true"},
+        included_features=ALL_FEATURES,
+    )
+    config.add_tonnikala_search_paths("anemic_test.web:templates")
+    config.add_route("tk", "/tk")
+    config.add_view(hello, route_name="tk", renderer="hello.tk")
+    app = config.make_wsgi_app()
+    registry = config.registry
+
+    assert not hasattr(registry, "tonnikala_renderer_factory")
+    assert get(app, "/tk") == "<p>Hello, World!</p>"
+    assert hasattr(registry, "tonnikala_renderer_factory")
+
+
+def test_directives_are_replayed_on_activation():
+    config = Configurator(settings={"anemic.defer_features": "true"})
+    config.include("anemic.web.renderers.tonnikala")
+    config.add_tonnikala_search_paths("anemic_test.web:templates")
+    config.add_route("tk", "/tk")
+    config.add_view(hello, route_name="tk", renderer="hello.tk")
+    app = config.make_wsgi_app()
+
+    assert get(app, "/tk") == "<p>Hello, World!</p>"
@@ -0,0 +1,140 @@
+import threading
+
+from pyramid.config import Configurator
+from zope.interface import Interface
+
+from anemic.web.services import BaseService
+
+
+class IMailer(Interface):
+    pass
+
+
+class ISearch(Interface):
+    pass
+
+
+def counting_factory(cls, calls, release=None):
+    def factory(registry):
+        if release is not None:
+            release.wait(5)
+
+        calls.append(cls)
+        return cls(registry=registry)
+
+    return factory
+
+
+class Mailer(BaseService):
+    pass
+
+
+class Search(BaseService):
+    pass
+
+
+def make_config(settings=None) -> Configurator:
+    config = Configurator(settings=settings or {})
+    config.include("anemic.web.services")
+    return config
+
+
+def test_lazy_services_are_built_on_first_lookup():
+    config = make_config({"anemic.lazy_services": "true"})
+    calls = []
+    config.register_anemic_service(counting_factory(Mailer, calls), interface=IMailer)
+    config.commit()
+    registry = config.registry
+    assert calls == []
+
+    mailer = registry.getUtility(IMailer)
+    assert isinstance(mailer, Mailer)
+    assert registry.queryUtility(IMailer) is mailer
+    assert registry.services.mailer is mailer
+    assert calls == [Mailer]
+
+
+def test_lazy_service_is_built_once_by_concurrent_lookups():
+    config = make_config()
+    calls = []
+    release = threading.Event()
+    config.register_anemic_service(
+        counting_factory(Mailer, calls, release), interface=IMailer, lazy=True
+    )
+    config.commit()
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(config.registry.getUtility(IMailer))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [Mailer]
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_lazy_service_is_registered_only_once():
+    config = make_config()
+    first, second = [], []
+    config.register_anemic_service(
+        counting_factory(Mailer, first), interface=IMailer, lazy=True
+    )
+    config.register_anemic_service(
+        counting_factory(Mailer, second), interface=IMailer, lazy=True
+    )
+    config.commit()
+
+    config.registry.getUtility(IMailer)
+    assert (first, second) == ([Mailer], [])
+
+
+def test_warm_services_builds_the_eager_lazy_services():
+    config = make_config()
+    calls = []
+    config.register_anemic_service(
+        counting_factory(Mailer, calls), interface=IMailer, lazy=True, eager=True
+    )
+    config.register_anemic_service(
+        counting_factory(Search, calls), interface=ISearch, lazy=True
+    )
+    config.commit()
+
+    timings = config.warm_services(max_workers=2)
+    assert calls == [Mailer]
+    assert [(t.interface, t.name) for t in timings] == [(IMailer, "")]
+    assert timings[0].seconds >= 0
+
+
+def test_utility_lookups_are_restored_when_all_lazy_services_are_built():
+    config = make_config()
+    calls = []
+    config.register_anemic_service(
+        counting_factory(Mailer, calls), interface=IMailer, lazy=True
+    )
+    config.register_anemic_service(
+        counting_factory(Search, calls), interface=ISearch, lazy=True
+    )
+    config.commit()
+    registry = config.registry
+    assert "getUtility" in vars(registry)
+
+    mailer = registry.getUtility(IMailer)
+    assert "getUtility" in vars(registry)
+
+    search = registry.queryUtility(ISearch)
+    assert "getUtility" not in vars(registry)
+    assert "queryUtility" not in vars(registry)
+
+    # the built services are registered as ordinary utilities
+    assert registry.getUtility(IMailer) is mailer
+    assert registry.queryUtility(ISearch) is search
+    assert calls == [Mailer, Search]
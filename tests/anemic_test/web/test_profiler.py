@@ -0,0 +1,127 @@
+import io
+import json
+
+from pyramid.config import Configurator
+from pytest import raises
+
+from anemic.web.config import ALL_FEATURES, application_factory, create_configurator
+from anemic.web.config.profiler import (
+    StartupProfiler,
+    StartupStep,
+    get_profiler,
+    profiling_configurator,
+)
+
+
+def test_steps_are_reported_slowest_first_as_a_table():
+    profiler = StartupProfiler()
+    with profiler.step("outer"):
+        with profiler.step("inner"):
+            pass
+
+    assert [step.label for step in profiler.steps] == ["inner", "outer"]
+    assert profiler.steps[1].seconds >= profiler.steps[0].seconds
+
+    stream = io.StringIO()
+    profiler.report(stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split() == ["step", "ms", "imports"]
+    assert [line.split()[0] for line in lines[1:]] == ["outer", "inner"]
+    assert profiler.reported
+
+
+def test_steps_are_reported_as_json():
+    stream = io.StringIO()
+    profiler = StartupProfiler("json", stream)
+    profiler.steps = [StartupStep("fast", 0.001, 0), StartupStep("slow", 0.5, 3)]
+    profiler.report()
+
+    assert json.loads(stream.getvalue()) == [
+        {"label": "slow", "seconds": 0.5, "imports": 3},
+        {"label": "fast", "seconds": 0.001, "imports": 0},
+    ]
+
+
+def test_invalid_report_format_is_rejected():
+    with raises(ValueError):
+        StartupProfiler("xml")
+
+
+def test_profiling_configurator_records_commits_and_make_wsgi_app():
+    stream = io.StringIO()
+    configurator_class = profiling_configurator(Configurator)
+    assert configurator_class.__name__ == "ProfilingConfigurator"
+
+    config = configurator_class()
+    # no profiler attached: the configurator works as usual
+    assert get_profiler(config) is None
+    config.commit()
+
+    profiler = config.registry.anemic_startup_profiler = StartupProfiler("json", stream)
+    config.make_wsgi_app()
+
+    labels = [step.label for step in profiler.steps]
+    assert "config.commit" in labels
+    assert labels[-1] == "make_wsgi_app"
+    assert {step["label"] for step in json.loads(stream.getvalue())} == set(labels)
+
+
+def test_create_configurator_profiles_every_feature():
+    stream = io.StringIO()
+    config = create_configurator(
+        package="anemic_test.web",
+        profile_startup="table",
+        included_features=ALL_FEATURES,
+    )
+    profiler = get_profiler(config)
+    profiler.stream = stream
+    config.make_wsgi_app()
+
+    labels = [step.label for step in profiler.steps]
+    assert labels[0] == "create configurator"
+    for feature in ALL_FEATURES:
+        assert "include anemic.web." + feature in labels
+
+    report = stream.getvalue()
+    assert "include anemic.web.renderers.tonnikala" in report
+    assert "make_wsgi_app" in report
+
+
+def test_application_factory_reports_the_wsgi_app_startup(capsys):
+    @application_factory(
+        package="anemic_test.web",
+        included_features=["services"],
+        profile_startup="json",
+    )
+    def main(config):
+        config.add_route("home", "/")
+
+    main({})
+    steps = json.loads(capsys.readouterr().err)
+    labels = {step["label"] for step in steps}
+    assert {
+        "create configurator",
+        "include anemic.web.services",
+        "factory " + main.__wrapped__.__qualname__,
+        "make_wsgi_app",
+    } <= labels
+
+
+def test_application_factory_reports_when_configuring_only(capsys):
+    @application_factory(
+        package="anemic_test.web",
+        configure_only=True,
+        profile_startup="table",
+    )
+    def configure(config):
+        return config
+
+    config = configure({})
+    assert isinstance(config, Configurator)
+    profiler = get_profiler(config)
+    assert profiler.reported
+
+    report = capsys.readouterr().err
+    assert report.splitlines()[0].split() == ["step", "ms", "imports"]
+    assert "factory " + configure.__wrapped__.__qualname__ in report
+    assert "make_wsgi_app" not in report
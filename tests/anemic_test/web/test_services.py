@@ -0,0 +1,142 @@
+from pyramid.config import Configurator
+from pyramid.request import Request, apply_request_extensions
+from pytest import raises
+from zope.interface import Interface, implementer
+
+from anemic.web.services import (
+    BaseService,
+    RequestScopedBaseService,
+    autowired,
+)
+
+
+class IExternal(Interface):
+    pass
+
+
+class IGreeter(Interface):
+    pass
+
+
+class External:
+    pass
+
+
+class Greeter(RequestScopedBaseService):
+    external: External = autowired(IExternal)
+
+
+class Clock(BaseService):
+    external: External = autowired(IExternal)
+
+
+def make_config(settings=None) -> Configurator:
+    config = Configurator(settings=settings or {})
+    config.include("anemic.web.services")
+    config.include("anemic.web.ioc")
+    return config
+
+
+def make_request(config: Configurator) -> Request:
+    request = Request.blank("/")
+    request.registry = config.registry
+    apply_request_extensions(request)
+    return request
+
+
+def test_request_services_are_resolved_from_the_request_container():
+    config = make_config()
+    config.register_anemic_service(Greeter, interface=IGreeter, scope="request")
+    config.commit()
+
+    request = make_request(config)
+    greeter = request.find_service(IGreeter)
+    assert isinstance(greeter, Greeter)
+    assert greeter is request.container.get(interface=IGreeter)
+    assert greeter is request.find_service(IGreeter)
+    assert make_request(config).find_service(IGreeter) is not greeter
+
+
+def test_autowired_falls_back_to_services_outside_the_containers():
+    config = make_config()
+    external = External()
+    config.register_service(external, IExternal)
+    config.register_anemic_service(Greeter, interface=IGreeter, scope="request")
+    config.commit()
+
+    request = make_request(config)
+    greeter = request.find_service(IGreeter)
+    assert request.find_service(IExternal) is external
+    assert greeter.external is external
+
+
+def test_global_autowired_falls_back_to_utilities():
+    config = make_config()
+    external = External()
+    config.registry.registerUtility(external, IExternal)
+    config.commit()
+
+    clock = Clock(registry=config.registry)
+    assert clock.external is external
+
+
+class IContextA(Interface):
+    pass
+
+
+class IContextB(Interface):
+    pass
+
+
+@implementer(IContextA)
+class ContextA:
+    pass
+
+
+@implementer(IContextB)
+class ContextB:
+    pass
+
+
+class ForA(RequestScopedBaseService):
+    pass
+
+
+class ForB(RequestScopedBaseService):
+    pass
+
+
+def test_request_services_are_discriminated_by_context():
+    config = make_config()
+    config.register_anemic_service(
+        ForA, interface=IGreeter, scope="request", context_iface=IContextA
+    )
+    config.register_anemic_service(
+        ForB, interface=IGreeter, scope="request", context_iface=IContextB
+    )
+    config.commit()
+
+    request = make_request(config)
+    assert isinstance(request.find_service(IGreeter, context=ContextA()), ForA)
+    assert isinstance(request.find_service(IGreeter, context=ContextB()), ForB)
+
+
+def test_errors_of_factories_are_not_retried_through_find_service():
+    config = make_config()
+    calls = []
+
+    def failing_factory(request):
+        calls.append(request)
+        raise LookupError("a nested dependency is missing")
+
+    config.register_anemic_service(
+        failing_factory, interface=IExternal, scope="request"
+    )
+    config.register_anemic_service(Greeter, interface=IGreeter, scope="request")
+    config.commit()
+
+    greeter = make_request(config).find_service(IGreeter)
+    with raises(LookupError, match="nested"):
+        greeter.external
+
+    assert len(calls) == 1